@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+from main import GameSimulator
+from games.move_record import replay_game
+from players.minimax_player import MinimaxPlayer
+from players.move_ordering import MoveOrderer
+from players.opening_book import best_move_mask, save_book
+
+
+def book_positions(game, plies):
+    """Move record of one representative of every unfinished position up to `plies` moves, up to symmetry"""
+    positions = {}
+
+    def visit():
+        key, _ = game.canonical_key()
+        if key in positions:
+            return
+        positions[key] = game.move_record()
+        if game.move_count == plies:
+            return
+        for move in game.get_valid_moves():
+            game.make_move(move)
+            if not game.game_over:
+                visit()
+            game.undo_move()
+
+    visit()
+    return positions
+
+
+def search_position(game, player, depth):
+    """Exact best score and every move that reaches it"""
+    player.root_ply = len(game.move_history)
+    best_score = float('-inf')
+    best_moves = []
+    moves = game.get_valid_moves()
+    if player.orderer is not None:
+        moves = player.orderer.order(moves, 0)
+
+    for move in moves:
+        game.make_move(move)
+        # Searching with alpha just below the best score keeps ties exact (scores are integers)
+        score = player._minimax(game, depth, False, best_score - 1, float('inf'))
+        game.undo_move()
+        if score > best_score:
+            best_score = score
+            best_moves = [move]
+        elif score == best_score:
+            best_moves.append(move)
+    return best_score, best_moves
+
+
+def _search_book_position(task):
+    """Worker: replay one position and search it"""
+    game_type, engine, record, depth, tt_size = task
+    game = replay_game(GameSimulator().create_game(game_type, engine), record)
+
+    # A fresh table and move ordering for every position: bounds and orderings left by earlier
+    # searches would change which tied moves are found, and so depend on which worker ran what
+    player = MinimaxPlayer(game.current_player, depth, tt_size, 0, True)
+    player.orderer = MoveOrderer(game)
+
+    key, transform = game.canonical_key()
+    value, best_moves = search_position(game, player, depth)
+    return key, value, best_move_mask(game, best_moves, transform)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a memory-mapped opening book by searching every early position')
+    parser.add_argument('game_type', nargs='?', default='c4',
+                        choices=['tictactoe', 'connectfour', 'ttt', 'c4'],
+                        help='Type of game (default: c4)')
+    parser.add_argument('-p', '--plies', type=int, default=6,
+                        help='Include every position with up to this many moves played (default: 6)')
+    parser.add_argument('-d', '--depth', type=int, default=6,
+                        help='Minimax depth used to score each position (default: 6)')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help='Processes searching positions in parallel (default: all cores)')
+    parser.add_argument('-tt', '--tt_size', type=int, default=1000000,
+                        help='Transposition table entries for each position search (default: 1000000)')
+    parser.add_argument('-e', '--engine', choices=['numpy', 'bitboard'], default='bitboard',
+                        help='Board representation used for the search (default: bitboard)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Book file to write (default: books/<game>_book.npy)')
+
+    args = parser.parse_args()
+    game_type = {'tictactoe': 'ttt', 'connectfour': 'c4'}.get(args.game_type, args.game_type)
+    output = args.output or os.path.join('books', f'{game_type}_book.npy')
+
+    game = GameSimulator().create_game(game_type, args.engine)
+    positions = book_positions(game, args.plies)
+    print(f"{len(positions):,} positions up to {args.plies} plies (after symmetry), searching at depth {args.depth}")
+
+    start = time.perf_counter()
+    tasks = [(game_type, args.engine, record, args.depth, args.tt_size) for record in positions.values()]
+    with Pool(args.workers) as pool:
+        records = []
+        for i, record in enumerate(pool.imap_unordered(_search_book_position, tasks, chunksize=16), 1):
+            records.append(record)
+            if i % 1000 == 0:
+                print(f"  {i:,}/{len(tasks):,} positions ({time.perf_counter() - start:.1f}s)")
+
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    save_book(output, records)
+    print(f"Wrote {len(records):,} positions to {output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,72 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import List, Tuple, Any, Optional
+import random
+import numpy as np
+from .move_record import encode_moves
+
+ZOBRIST_SEED = 20250601
+
+# XORed into the position key when player 2 is to move
+SIDE_TO_MOVE_KEY = random.Random(ZOBRIST_SEED).getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def zobrist_table(num_cells: int) -> Tuple[Tuple[int, int, int], ...]:
+    """Random 64-bit key per (cell, player), seeded so every process and engine agrees"""
+    rng = random.Random(ZOBRIST_SEED + num_cells)
+    return tuple((0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(num_cells))
+
+
+def grid_symmetries(rows: int, cols: int, gravity: bool = False) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Cell permutations, other than the identity, that map a rows x cols board
+    onto itself: perm[cell] is where the cell lands. Gravity games only keep
+    the left-right mirror since flipping rows would float pieces.
+    """
+    grid = np.arange(rows * cols).reshape(rows, cols)
+    moved_grids = [grid[:, ::-1]]
+    if not gravity:
+        moved_grids += [grid[::-1, :], grid[::-1, ::-1]]
+        if rows == cols:
+            moved_grids += [np.rot90(grid), np.rot90(grid, 3), grid.T, np.rot90(grid, 2).T]
+
+    symmetries = []
+    for moved in moved_grids:
+        perm = [0] * (rows * cols)
+        for new_cell, old_cell in enumerate(moved.flat):
+            perm[old_cell] = new_cell
+        symmetries.append(tuple(perm))
+    return tuple(symmetries)
+
+
+def invert_permutations(perms) -> Tuple[Tuple[int, ...], ...]:
+    inverses = []
+    for perm in perms:
+        inverse = [0] * len(perm)
+        for cell, image in enumerate(perm):
+            inverse[image] = cell
+        inverses.append(tuple(inverse))
+    return tuple(inverses)
 
 
 class BaseGame(ABC):
+    # Zobrist keys indexed by [row * cols + col][player]; set by each game
+    zobrist_keys = ()
+    # Non-identity board symmetries as cell permutations; transform t >= 1
+    # in canonical_key refers to symmetry_maps[t - 1]
+    symmetry_maps = ()
+    # Gravity games take a column as their move, other games a (row, col) cell
+    gravity = False
+
     def __init__(self):
         self.board = None
         self.current_player = 1
         self.game_over = False
         self.winner = None
+        self.last_cell = None
+        self.move_history = []
+        self.reset_position_keys()
 
     @abstractmethod
     def initialize_board(self) -> Any:
@@ -17,6 +76,11 @@ class BaseGame(ABC):
     def make_move(self, move: Any) -> bool:
         pass
 
+    @abstractmethod
+    def remove_piece(self, cell: Tuple[int, int]) -> None:
+        """Clear a cell filled by the current player (used by undo_move)"""
+        pass
+
     @abstractmethod
     def get_valid_moves(self) -> List[Any]:
         pass
@@ -36,6 +100,93 @@ class BaseGame(ABC):
     def switch_player(self):
         self.current_player = 3 - self.current_player  # Switches between 1 and 2
 
+    def push_move_state(self, cell: Tuple[int, int]):
+        """Remember what make_move is about to overwrite so undo_move can restore it"""
+        self.move_history.append((cell, self.last_cell, self.game_over, self.winner))
+
+    def undo_move(self) -> bool:
+        """Take back the last move, restoring board, player to move, game_over and winner"""
+        if not self.move_history:
+            return False
+
+        cell, self.last_cell, self.game_over, self.winner = self.move_history.pop()
+        self.switch_player()
+        self.remove_piece(cell)
+        return True
+
+    @property
+    def move_code_base(self) -> int:
+        """Number of distinct move indices, the base of move_record()"""
+        return self.cols if self.gravity else self.rows * self.cols
+
+    def move_index(self, cell: Tuple[int, int]) -> int:
+        """Compact index of the move that filled `cell`: its column or its flat cell number"""
+        return cell[1] if self.gravity else cell[0] * self.cols + cell[1]
+
+    def decode_move(self, move_index: int) -> Any:
+        return move_index if self.gravity else divmod(move_index, self.cols)
+
+    def move_record(self) -> int:
+        """Every move since the board was set, packed into one integer (see games.move_record)"""
+        return encode_moves([self.move_index(entry[0]) for entry in self.move_history], self.move_code_base)
+
+    @property
+    def position_key(self) -> int:
+        """64-bit Zobrist key of the pieces on the board and the player to move"""
+        if self.current_player == 2:
+            return self.piece_key ^ SIDE_TO_MOVE_KEY
+        return self.piece_key
+
+    def toggle_piece_key(self, cell_index: int, player: int):
+        """XOR a piece into (or out of) the position key and its symmetric images"""
+        zobrist_keys = self.zobrist_keys
+        self.piece_key ^= zobrist_keys[cell_index][player]
+        symmetry_keys = self.symmetry_keys
+        for t, perm in enumerate(self.symmetry_maps):
+            symmetry_keys[t] ^= zobrist_keys[perm[cell_index]][player]
+
+    def reset_position_keys(self, board=None):
+        """Recompute every key from a board array, for when a board is assigned directly"""
+        self.piece_key = 0
+        self.symmetry_keys = [0] * len(self.symmetry_maps)
+        if board is None:
+            return
+
+        rows, cols = board.shape
+        for row in range(rows):
+            for col in range(cols):
+                player = int(board[row, col])
+                if player:
+                    self.toggle_piece_key(row * cols + col, player)
+
+    def canonical_key(self) -> Tuple[int, int]:
+        """
+        Smallest position key over all board symmetries, plus the transform
+        that produced it (0 is the identity). Use transform_move to map a move
+        into the canonical frame and inverse_transform_move to map it back.
+        """
+        side_key = SIDE_TO_MOVE_KEY if self.current_player == 2 else 0
+        best_key = self.piece_key ^ side_key
+        best_transform = 0
+        for t, key in enumerate(self.symmetry_keys, 1):
+            key ^= side_key
+            if key < best_key:
+                best_key = key
+                best_transform = t
+        return best_key, best_transform
+
+    def transform_move(self, move: Any, transform: int) -> Any:
+        """Map a move into the frame of a canonical_key transform"""
+        if transform == 0:
+            return move
+        raise NotImplementedError(f"{self.__class__.__name__} does not define board symmetries")
+
+    def inverse_transform_move(self, move: Any, transform: int) -> Any:
+        """Map a move found in a transformed frame back to this board"""
+        if transform == 0:
+            return move
+        raise NotImplementedError(f"{self.__class__.__name__} does not define board symmetries")
+
     def get_game_state(self):
         return {
             'board': self.board,
@@ -0,0 +1,136 @@
+from typing import Tuple
+import numpy as np
+from .move_record import encode_moves
+
+
+class BatchGame:
+    """
+    Plays many independent games of the same k-in-a-row game in lockstep.
+
+    All boards live in one (num_games, rows, cols) array. Moves are integer
+    actions: a column for gravity games (Connect Four) or a flat cell index
+    row * cols + col otherwise (Tic Tac Toe). Finished slots are reset
+    automatically so the caller can keep every slot busy; with auto_reset off
+    they become inactive until reset instead. The length and move record of
+    each game finished by the last step are kept in finished_games.
+    """
+
+    def __init__(self, num_games: int, rows: int, cols: int, connect: int, gravity: bool,
+                 auto_reset: bool = True):
+        self.num_games = num_games
+        self.rows = rows
+        self.cols = cols
+        self.connect = connect
+        self.gravity = gravity
+        self.auto_reset = auto_reset
+        self.num_actions = cols if gravity else rows * cols
+        self.cell_windows = self._build_cell_windows()
+
+        self.boards = np.zeros((num_games, rows, cols), dtype=np.int8)
+        self.heights = np.zeros((num_games, cols), dtype=np.int8)
+        self.move_count = np.zeros(num_games, dtype=np.int16)
+        self.moves = np.zeros((num_games, rows * cols), dtype=np.int16)
+        self.finished_games = {}
+        self.current_player = np.ones(num_games, dtype=np.int8)
+        self.active = np.ones(num_games, dtype=bool)
+
+    def _build_cell_windows(self) -> np.ndarray:
+        """For every cell, the flat indices of each k-window through it"""
+        windows = []
+        for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    end_row = row + (self.connect - 1) * d_row
+                    end_col = col + (self.connect - 1) * d_col
+                    if 0 <= end_row < self.rows and 0 <= end_col < self.cols:
+                        windows.append([(row + i * d_row) * self.cols + col + i * d_col
+                                        for i in range(self.connect)])
+
+        if not windows:
+            # connect is longer than the board in every direction: no game can be won, only drawn
+            return np.empty((self.rows * self.cols, 0, self.connect), dtype=np.intp)
+
+        per_cell = [[w for w in windows if cell in w] for cell in range(self.rows * self.cols)]
+        width = max(len(cell_windows) for cell_windows in per_cell)
+        # Pad with repeats of a real window so every row has the same length
+        table = [cell_windows + [cell_windows[0]] * (width - len(cell_windows))
+                 for cell_windows in per_cell]
+        return np.array(table, dtype=np.intp)
+
+    def valid_move_mask(self) -> np.ndarray:
+        """Boolean (num_games, num_actions) mask of legal actions"""
+        if self.gravity:
+            return self.heights < self.rows
+        return self.boards.reshape(self.num_games, -1) == 0
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply one action to every active game.
+
+        Returns a (num_games,) mask of games that just finished and their
+        winners (1 or 2, 0 for a draw). Actions for inactive slots are ignored.
+        """
+        games = np.flatnonzero(self.active)
+        actions = np.asarray(actions)[games]
+        players = self.current_player[games]
+
+        if self.gravity:
+            cols = actions
+            rows = self.rows - 1 - self.heights[games, cols]
+            self.heights[games, cols] += 1
+        else:
+            rows, cols = np.divmod(actions, self.cols)
+
+        self.boards[games, rows, cols] = players
+        self.moves[games, self.move_count[games]] = actions
+        self.move_count[games] += 1
+
+        cells = rows * self.cols + cols
+        flat = self.boards.reshape(self.num_games, -1)
+        lines = flat[games[:, None, None], self.cell_windows[cells]]
+        won = (lines == players[:, None, None]).all(axis=2).any(axis=1)
+        drawn = ~won & (self.move_count[games] == self.rows * self.cols)
+
+        finished = np.zeros(self.num_games, dtype=bool)
+        winners = np.zeros(self.num_games, dtype=np.int8)
+        finished[games] = won | drawn
+        winners[games] = np.where(won, players, 0)
+
+        self.finished_games = {}
+        for slot in np.flatnonzero(finished):
+            num_moves = int(self.move_count[slot])
+            self.finished_games[slot] = (num_moves, encode_moves(self.moves[slot, :num_moves].tolist(),
+                                                                 self.num_actions))
+
+        self.current_player[games] = 3 - players
+        if self.auto_reset:
+            self.reset(finished)
+        else:
+            self.active[finished] = False
+        return finished, winners
+
+    def reset(self, slots=None):
+        """Clear and activate the given slots (boolean mask or indices), or every slot"""
+        if slots is None:
+            slots = slice(None)
+        self.active[slots] = True
+        self.boards[slots] = 0
+        self.heights[slots] = 0
+        self.move_count[slots] = 0
+        self.current_player[slots] = 1
+
+
+class BatchTicTacToe(BatchGame):
+    def __init__(self, num_games: int, auto_reset: bool = True):
+        super().__init__(num_games, 3, 3, 3, gravity=False, auto_reset=auto_reset)
+
+    def action_to_move(self, action: int) -> Tuple[int, int]:
+        return divmod(int(action), self.cols)
+
+
+class BatchConnectFour(BatchGame):
+    def __init__(self, num_games: int, auto_reset: bool = True):
+        super().__init__(num_games, 6, 7, 4, gravity=True, auto_reset=auto_reset)
+
+    def action_to_move(self, action: int) -> int:
+        return int(action)
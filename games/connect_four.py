@@ -1,9 +1,13 @@
-from .base_game import BaseGame
-from typing import List, Optional
+from .base_game import BaseGame, zobrist_table, grid_symmetries
+from typing import List, Optional, Tuple
 import numpy as np
 
 
 class ConnectFour(BaseGame):
+    gravity = True
+    zobrist_keys = zobrist_table(6 * 7)
+    symmetry_maps = grid_symmetries(6, 7, gravity=True)  # Left-right mirror
+
     def __init__(self):
         super().__init__()
         self.rows = 6
@@ -16,20 +20,59 @@ class ConnectFour(BaseGame):
         self.game_over = False
         self.winner = None
 
+    @property
+    def board(self):
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        # Assigning a board directly resets the incremental bookkeeping
+        self._board = board
+        self.last_cell = None
+        self.move_history = []
+        self.reset_position_keys(board)
+        if board is None:
+            self.heights = []
+            self.move_count = 0
+        else:
+            self.heights = [int(np.count_nonzero(board[:, col])) for col in range(board.shape[1])]
+            self.move_count = sum(self.heights)
+
     def make_move(self, column: int) -> bool:
         if column < 0 or column >= self.cols:
             return False
 
-        for row in range(self.rows - 1, -1, -1):
-            if self.board[row, column] == 0:
-                self.board[row, column] = self.current_player
-                self.check_game_state()
-                self.switch_player()
-                return True
-        return False
+        height = self.heights[column]
+        if height == self.rows:
+            return False
+
+        row = self.rows - 1 - height
+        self.push_move_state((row, column))
+        self._board[row, column] = self.current_player
+        self.toggle_piece_key(row * self.cols + column, self.current_player)
+        self.heights[column] = height + 1
+        self.move_count += 1
+        self.last_cell = (row, column)
+        self.check_game_state()
+        self.switch_player()
+        return True
+
+    def remove_piece(self, cell: Tuple[int, int]):
+        row, column = cell
+        self._board[row, column] = 0
+        self.toggle_piece_key(row * self.cols + column, self.current_player)
+        self.heights[column] -= 1
+        self.move_count -= 1
+
+    def transform_move(self, column: int, transform: int) -> int:
+        # The only symmetry is the mirror, which is its own inverse
+        return column if transform == 0 else self.cols - 1 - column
+
+    def inverse_transform_move(self, column: int, transform: int) -> int:
+        return self.transform_move(column, transform)
 
     def get_valid_moves(self) -> List[int]:
-        return [col for col in range(self.cols) if self.board[0, col] == 0]
+        return [col for col in range(self.cols) if self.heights[col] < self.rows]
 
     def check_winner(self) -> Optional[int]:
         # Check horizontal
@@ -63,22 +106,45 @@ class ConnectFour(BaseGame):
         return None
 
     def is_draw(self) -> bool:
-        return len(self.get_valid_moves()) == 0 and self.check_winner() is None
+        return self.move_count == self.rows * self.cols and self.check_winner() is None
+
+    def check_last_move(self) -> Optional[int]:
+        """Check only the four lines through the last placed cell"""
+        board = self._board
+        row, col = self.last_cell
+        player = board[row, col]
+
+        for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * d_row, col + sign * d_col
+                while 0 <= r < self.rows and 0 <= c < self.cols and board[r, c] == player:
+                    count += 1
+                    r += sign * d_row
+                    c += sign * d_col
+            if count >= 4:
+                return int(player)
+        return None
 
     def check_game_state(self):
-        winner = self.check_winner()
+        if self.last_cell is None:
+            winner = self.check_winner()
+        else:
+            winner = self.check_last_move()
+
         if winner is not None:
             self.game_over = True
             self.winner = winner
-        elif self.is_draw():
+        elif self.move_count == self.rows * self.cols:
             self.game_over = True
             self.winner = 0
 
     def display_board(self) -> str:
         symbols = {0: ' ', 1: 'X', 2: 'O'}
+        board = self.board
         board_str = "\n"
         for i in range(self.rows):
-            row = [symbols[self.board[i, j]] for j in range(self.cols)]
+            row = [symbols[board[i, j]] for j in range(self.cols)]
             board_str += "| " + " | ".join(row) + " |\n"
         board_str += "-" * (self.cols * 4 - 1) + "\n"
         board_str += "  " + "   ".join(map(str, range(self.cols))) + "\n"
@@ -0,0 +1,123 @@
+from .connect_four import ConnectFour
+from typing import List, Optional, Tuple
+import numpy as np
+
+ROWS = 6
+COLS = 7
+# Each column uses ROWS + 1 bits: one per cell plus a sentinel bit on top,
+# so shifted win tests never wrap from one column into the next.
+COLUMN_HEIGHT = ROWS + 1
+
+BOTTOM_MASKS = [1 << (col * COLUMN_HEIGHT) for col in range(COLS)]
+TOP_MASKS = [1 << (col * COLUMN_HEIGHT + ROWS - 1) for col in range(COLS)]
+TOP_ROW = sum(TOP_MASKS)
+
+# Shift distances for vertical, horizontal and both diagonal directions
+DIRECTIONS = (1, COLUMN_HEIGHT, COLUMN_HEIGHT - 1, COLUMN_HEIGHT + 1)
+
+
+def has_four(bitboard: int) -> bool:
+    """Return True if the bitboard contains four aligned pieces"""
+    for shift in DIRECTIONS:
+        pairs = bitboard & (bitboard >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+class BitboardConnectFour(ConnectFour):
+    """
+    Connect Four stored as two 64-bit masks (one per player) plus column heights.
+
+    Bit (col * 7 + h) is the cell h rows above the bottom of column col.
+    The `board` attribute is still available as a 6x7 NumPy array (row 0 at
+    the top) so existing players can read and assign it unchanged. The array
+    is a mirror written one cell per move; the bitboards are authoritative.
+    """
+
+    def initialize_board(self):
+        self.board = None  # Clears the bitboards, heights and move counter
+        self.current_player = 1
+        self.game_over = False
+        self.winner = None
+
+    @property
+    def board(self) -> np.ndarray:
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        self.bitboards = [0, 0, 0]  # Indexed by player number, slot 0 unused
+        self.mask = 0
+        self.heights = [0] * COLS
+        self.move_count = 0
+        self.last_cell = None
+        self.move_history = []
+        self.reset_position_keys(board)
+        if board is None:
+            self._board = np.zeros((ROWS, COLS), dtype=int)
+            return
+
+        self._board = board
+        for col in range(COLS):
+            for row in range(ROWS - 1, -1, -1):
+                player = int(board[row, col])
+                if player == 0:
+                    break
+                bit = 1 << (col * COLUMN_HEIGHT + self.heights[col])
+                self.bitboards[player] |= bit
+                self.mask |= bit
+                self.heights[col] += 1
+                self.move_count += 1
+
+    def make_move(self, column: int) -> bool:
+        if column < 0 or column >= self.cols:
+            return False
+        if self.mask & TOP_MASKS[column]:
+            return False
+
+        height = self.heights[column]
+        self.push_move_state((ROWS - 1 - height, column))
+        bit = 1 << (column * COLUMN_HEIGHT + height)
+        self.bitboards[self.current_player] |= bit
+        self.mask |= bit
+        self._board[ROWS - 1 - height, column] = self.current_player
+        self.toggle_piece_key((ROWS - 1 - height) * COLS + column, self.current_player)
+        self.heights[column] = height + 1
+        self.move_count += 1
+        self.last_cell = (ROWS - 1 - height, column)
+        self.check_game_state()
+        self.switch_player()
+        return True
+
+    def remove_piece(self, cell: Tuple[int, int]):
+        column = cell[1]
+        self.heights[column] -= 1
+        bit = 1 << (column * COLUMN_HEIGHT + self.heights[column])
+        self.bitboards[self.current_player] &= ~bit
+        self.mask &= ~bit
+        self._board[cell] = 0
+        self.toggle_piece_key(cell[0] * COLS + column, self.current_player)
+        self.move_count -= 1
+
+    def get_valid_moves(self) -> List[int]:
+        free = TOP_ROW & ~self.mask
+        return [col for col in range(COLS) if free & TOP_MASKS[col]]
+
+    def check_winner(self) -> Optional[int]:
+        for player in (1, 2):
+            if has_four(self.bitboards[player]):
+                return player
+        return None
+
+    def is_draw(self) -> bool:
+        return self.mask & TOP_ROW == TOP_ROW and self.check_winner() is None
+
+    def check_last_move(self) -> Optional[int]:
+        """Only the player who made the last move can have completed a line"""
+        row, col = self.last_cell
+        height = ROWS - 1 - row
+        for player in (1, 2):
+            if self.bitboards[player] >> (col * COLUMN_HEIGHT + height) & 1:
+                return player if has_four(self.bitboards[player]) else None
+        return None
@@ -0,0 +1,235 @@
+from .base_game import BaseGame, zobrist_table, grid_symmetries, invert_permutations
+from typing import List, Optional, Tuple, Union
+import numpy as np
+
+
+class IndexedSet:
+    """Set of small integers with O(1) add/remove and cheap iteration"""
+
+    def __init__(self, size: int):
+        self.items = []
+        self.position = [-1] * size
+
+    def __contains__(self, item: int) -> bool:
+        return self.position[item] >= 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: int):
+        if self.position[item] < 0:
+            self.position[item] = len(self.items)
+            self.items.append(item)
+
+    def remove(self, item: int):
+        index = self.position[item]
+        if index < 0:
+            return
+        last = self.items.pop()
+        if last != item:
+            self.items[index] = last
+            self.position[last] = index
+        self.position[item] = -1
+
+
+class MNKGame(BaseGame):
+    """
+    Generalized k-in-a-row on an m x n board, e.g. Gomoku (15x15, k=5) or
+    Connect-k with gravity (moves are then columns, as in ConnectFour).
+
+    Win checks only walk the four lines through the last move, so they cost
+    O(k). Empty cells are kept in a sparse set; with frontier_radius > 0,
+    get_valid_moves only offers empty cells within that distance of a piece,
+    which keeps the branching factor of large boards manageable.
+    """
+
+    def __init__(self, rows: int = 15, cols: int = 15, connect: int = 5, gravity: bool = False,
+                 frontier_radius: int = 0):
+        self.rows = rows
+        self.cols = cols
+        self.connect = connect
+        self.gravity = gravity
+        self.frontier_radius = 0 if gravity else frontier_radius
+        self.zobrist_keys = zobrist_table(rows * cols)
+        self.symmetry_maps = grid_symmetries(rows, cols, gravity)
+        self.inverse_symmetry_maps = invert_permutations(self.symmetry_maps)
+        self.neighbors = self._build_neighbors()
+        super().__init__()
+        self.initialize_board()
+
+    def _build_neighbors(self) -> List[List[int]]:
+        """Cells within frontier_radius (Chebyshev distance) of each cell"""
+        radius = self.frontier_radius
+        neighbors = []
+        for row in range(self.rows):
+            for col in range(self.cols):
+                cells = []
+                for r in range(max(0, row - radius), min(self.rows, row + radius + 1)):
+                    for c in range(max(0, col - radius), min(self.cols, col + radius + 1)):
+                        if (r, c) != (row, col):
+                            cells.append(r * self.cols + c)
+                neighbors.append(cells)
+        return neighbors
+
+    def initialize_board(self):
+        self.board = np.zeros((self.rows, self.cols), dtype=int)
+        self.current_player = 1
+        self.game_over = False
+        self.winner = None
+
+    @property
+    def board(self):
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        # Assigning a board directly rebuilds the incremental bookkeeping
+        self._board = board
+        self.last_cell = None
+        self.move_history = []
+        self.reset_position_keys(board)
+        if board is None:
+            return
+
+        num_cells = self.rows * self.cols
+        self.heights = [int(np.count_nonzero(board[:, col])) for col in range(self.cols)]
+        self.move_count = int(np.count_nonzero(board))
+        self.empty_cells = IndexedSet(num_cells)
+        self.frontier = IndexedSet(num_cells)
+        self.neighbor_count = [0] * num_cells
+
+        flat = board.reshape(-1)
+        for cell in range(num_cells):
+            if flat[cell] == 0:
+                self.empty_cells.add(cell)
+            else:
+                for neighbor in self.neighbors[cell]:
+                    self.neighbor_count[neighbor] += 1
+        for cell in self.empty_cells.items:
+            if self.neighbor_count[cell]:
+                self.frontier.add(cell)
+
+    def make_move(self, move: Union[int, Tuple[int, int]]) -> bool:
+        if self.gravity:
+            col = move
+            if col < 0 or col >= self.cols or self.heights[col] == self.rows:
+                return False
+            row = self.rows - 1 - self.heights[col]
+        else:
+            row, col = move
+            if not (0 <= row < self.rows and 0 <= col < self.cols) or self._board[row, col] != 0:
+                return False
+
+        self.push_move_state((row, col))
+        self._place(row, col, self.current_player)
+        self.last_cell = (row, col)
+        self.check_game_state()
+        self.switch_player()
+        return True
+
+    def _place(self, row: int, col: int, player: int):
+        cell = row * self.cols + col
+        self._board[row, col] = player
+        self.toggle_piece_key(cell, player)
+        self.heights[col] += 1
+        self.move_count += 1
+        self.empty_cells.remove(cell)
+        self.frontier.remove(cell)
+        for neighbor in self.neighbors[cell]:
+            self.neighbor_count[neighbor] += 1
+            if neighbor in self.empty_cells:
+                self.frontier.add(neighbor)
+
+    def remove_piece(self, cell: Tuple[int, int]):
+        row, col = cell
+        index = row * self.cols + col
+        self._board[row, col] = 0
+        self.toggle_piece_key(index, self.current_player)
+        self.heights[col] -= 1
+        self.move_count -= 1
+        for neighbor in self.neighbors[index]:
+            self.neighbor_count[neighbor] -= 1
+            if self.neighbor_count[neighbor] == 0:
+                self.frontier.remove(neighbor)
+        self.empty_cells.add(index)
+        if self.neighbor_count[index]:
+            self.frontier.add(index)
+
+    def get_valid_moves(self) -> List[Union[int, Tuple[int, int]]]:
+        if self.gravity:
+            return [col for col in range(self.cols) if self.heights[col] < self.rows]
+
+        cells = self.frontier if self.frontier_radius and self.move_count else self.empty_cells
+        return [divmod(cell, self.cols) for cell in sorted(cells.items)]
+
+    def check_winner(self) -> Optional[int]:
+        # Full scan, only needed when no last move is known
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if self._board[row, col] != 0 and self._line_through(row, col):
+                    return int(self._board[row, col])
+        return None
+
+    def _line_through(self, row: int, col: int) -> bool:
+        board = self._board
+        player = board[row, col]
+        for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * d_row, col + sign * d_col
+                while 0 <= r < self.rows and 0 <= c < self.cols and board[r, c] == player:
+                    count += 1
+                    r += sign * d_row
+                    c += sign * d_col
+            if count >= self.connect:
+                return True
+        return False
+
+    def check_last_move(self) -> Optional[int]:
+        row, col = self.last_cell
+        if self._line_through(row, col):
+            return int(self._board[row, col])
+        return None
+
+    def is_draw(self) -> bool:
+        return self.move_count == self.rows * self.cols and self.check_winner() is None
+
+    def check_game_state(self):
+        if self.last_cell is None:
+            winner = self.check_winner()
+        else:
+            winner = self.check_last_move()
+
+        if winner is not None:
+            self.game_over = True
+            self.winner = winner
+        elif self.move_count == self.rows * self.cols:
+            self.game_over = True
+            self.winner = 0
+
+    def transform_move(self, move, transform: int):
+        if transform == 0:
+            return move
+        if self.gravity:
+            return self.cols - 1 - move  # Only the mirror exists
+        return divmod(self.symmetry_maps[transform - 1][move[0] * self.cols + move[1]], self.cols)
+
+    def inverse_transform_move(self, move, transform: int):
+        if transform == 0:
+            return move
+        if self.gravity:
+            return self.cols - 1 - move
+        return divmod(self.inverse_symmetry_maps[transform - 1][move[0] * self.cols + move[1]], self.cols)
+
+    def display_board(self) -> str:
+        symbols = {0: '.', 1: 'X', 2: 'O'}
+        board = self._board
+        width = len(str(max(self.rows, self.cols) - 1))
+        board_str = "\n"
+        for i in range(self.rows):
+            row = [symbols[board[i, j]].rjust(width) for j in range(self.cols)]
+            prefix = "" if self.gravity else str(i).rjust(width) + " "
+            board_str += prefix + " ".join(row) + "\n"
+        prefix = "" if self.gravity else " " * (width + 1)
+        board_str += prefix + " ".join(str(j).rjust(width) for j in range(self.cols)) + "\n"
+        return board_str
@@ -1,9 +1,15 @@
-from .base_game import BaseGame
+from .base_game import BaseGame, zobrist_table, grid_symmetries, invert_permutations
 from typing import List, Tuple, Optional
 import numpy as np
 
 
 class TicTacToe(BaseGame):
+    rows = 3
+    cols = 3
+    zobrist_keys = zobrist_table(9)
+    symmetry_maps = grid_symmetries(3, 3)  # Rotations and reflections
+    inverse_symmetry_maps = invert_permutations(symmetry_maps)
+
     def __init__(self):
         super().__init__()
         self.initialize_board()
@@ -14,15 +20,47 @@ class TicTacToe(BaseGame):
         self.game_over = False
         self.winner = None
 
+    @property
+    def board(self):
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        # Assigning a board directly resets the incremental bookkeeping
+        self._board = board
+        self.move_count = 0 if board is None else int(np.count_nonzero(board))
+        self.reset_position_keys(board)
+        self.last_cell = None
+        self.move_history = []
+
     def make_move(self, move: Tuple[int, int]) -> bool:
         row, col = move
-        if self.board[row, col] == 0:
-            self.board[row, col] = self.current_player
+        if self._board[row, col] == 0:
+            self.push_move_state((row, col))
+            self._board[row, col] = self.current_player
+            self.toggle_piece_key(row * 3 + col, self.current_player)
+            self.move_count += 1
+            self.last_cell = (row, col)
             self.check_game_state()
             self.switch_player()
             return True
         return False
 
+    def remove_piece(self, cell: Tuple[int, int]):
+        self._board[cell] = 0
+        self.toggle_piece_key(cell[0] * 3 + cell[1], self.current_player)
+        self.move_count -= 1
+
+    def transform_move(self, move: Tuple[int, int], transform: int) -> Tuple[int, int]:
+        if transform == 0:
+            return move
+        return divmod(self.symmetry_maps[transform - 1][move[0] * 3 + move[1]], 3)
+
+    def inverse_transform_move(self, move: Tuple[int, int], transform: int) -> Tuple[int, int]:
+        if transform == 0:
+            return move
+        return divmod(self.inverse_symmetry_maps[transform - 1][move[0] * 3 + move[1]], 3)
+
     def get_valid_moves(self) -> List[Tuple[int, int]]:
         moves = []
         for i in range(3):
@@ -48,14 +86,34 @@ class TicTacToe(BaseGame):
         return None
 
     def is_draw(self) -> bool:
-        return len(self.get_valid_moves()) == 0 and self.check_winner() is None
+        return self.move_count == 9 and self.check_winner() is None
+
+    def check_last_move(self) -> Optional[int]:
+        """Check only the lines through the last placed cell"""
+        board = self._board
+        row, col = self.last_cell
+        player = board[row, col]
+
+        if board[row, 0] == board[row, 1] == board[row, 2]:
+            return int(player)
+        if board[0, col] == board[1, col] == board[2, col]:
+            return int(player)
+        if row == col and board[0, 0] == board[1, 1] == board[2, 2]:
+            return int(player)
+        if row + col == 2 and board[0, 2] == board[1, 1] == board[2, 0]:
+            return int(player)
+        return None
 
     def check_game_state(self):
-        winner = self.check_winner()
+        if self.last_cell is None:
+            winner = self.check_winner()
+        else:
+            winner = self.check_last_move()
+
         if winner is not None:
             self.game_over = True
             self.winner = winner
-        elif self.is_draw():
+        elif self.move_count == 9:
             self.game_over = True
             self.winner = 0
 
@@ -0,0 +1,110 @@
+from .tic_tac_toe import TicTacToe
+from typing import List, Tuple, Optional
+import numpy as np
+
+# Bit (row * 3 + col) marks a cell; every table below is indexed by a 9-bit mask
+FULL_MASK = (1 << 9) - 1
+CELLS = [(row, col) for row in range(3) for col in range(3)]
+
+LINES = [
+    0b000000111, 0b000111000, 0b111000000,  # Rows
+    0b001001001, 0b010010010, 0b100100100,  # Columns
+    0b100010001, 0b001010100                # Diagonals
+]
+
+# Built once at import: does a player's mask contain a full line?
+HAS_LINE = [any(mask & line == line for line in LINES) for mask in range(FULL_MASK + 1)]
+
+# Built once at import: valid moves for every occupied-cells mask
+VALID_MOVES = [tuple(CELLS[i] for i in range(9) if not occupied >> i & 1)
+               for occupied in range(FULL_MASK + 1)]
+
+
+class BitboardTicTacToe(TicTacToe):
+    """
+    Tic Tac Toe stored as two 9-bit masks, one per player.
+
+    Winner, draw and valid-move queries are table lookups. The `board`
+    attribute is still a 3x3 NumPy array for existing players, materialized
+    lazily from the masks and cached until the next move.
+    """
+
+    def initialize_board(self):
+        self.board = None  # Clears the masks and move counter
+        self.current_player = 1
+        self.game_over = False
+        self.winner = None
+
+    @property
+    def board(self) -> np.ndarray:
+        if self._board_view is None:
+            board = np.zeros(9, dtype=int)
+            for player in (1, 2):
+                mask = self.masks[player]
+                for i in range(9):
+                    if mask >> i & 1:
+                        board[i] = player
+            self._board_view = board.reshape(3, 3)
+        return self._board_view
+
+    @board.setter
+    def board(self, board):
+        self.masks = [0, 0, 0]  # Indexed by player number, slot 0 unused
+        self.occupied = 0
+        self.move_count = 0
+        self.last_cell = None
+        self.move_history = []
+        self.reset_position_keys(board)
+        self._board_view = None
+        if board is None:
+            return
+
+        for i, (row, col) in enumerate(CELLS):
+            player = int(board[row, col])
+            if player:
+                self.masks[player] |= 1 << i
+                self.occupied |= 1 << i
+                self.move_count += 1
+
+    def make_move(self, move: Tuple[int, int]) -> bool:
+        row, col = move
+        bit = 1 << (row * 3 + col)
+        if self.occupied & bit:
+            return False
+
+        self.push_move_state((row, col))
+        self.masks[self.current_player] |= bit
+        self.occupied |= bit
+        self.toggle_piece_key(row * 3 + col, self.current_player)
+        self.move_count += 1
+        self.last_cell = (row, col)
+        self._board_view = None
+        self.check_game_state()
+        self.switch_player()
+        return True
+
+    def remove_piece(self, cell: Tuple[int, int]):
+        bit = 1 << (cell[0] * 3 + cell[1])
+        self.masks[self.current_player] &= ~bit
+        self.occupied &= ~bit
+        self.toggle_piece_key(cell[0] * 3 + cell[1], self.current_player)
+        self.move_count -= 1
+        self._board_view = None
+
+    def get_valid_moves(self) -> List[Tuple[int, int]]:
+        return list(VALID_MOVES[self.occupied])
+
+    def check_winner(self) -> Optional[int]:
+        for player in (1, 2):
+            if HAS_LINE[self.masks[player]]:
+                return player
+        return None
+
+    def is_draw(self) -> bool:
+        return self.occupied == FULL_MASK and self.check_winner() is None
+
+    def check_last_move(self) -> Optional[int]:
+        row, col = self.last_cell
+        bit = 1 << (row * 3 + col)
+        player = 1 if self.masks[1] & bit else 2
+        return player if HAS_LINE[self.masks[player]] else None
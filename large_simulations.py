@@ -9,9 +9,21 @@ class LargeSimulationRunner:
     def __init__(self):
         self.simulator = GameSimulator()
         self.all_player_types = ['random', 'minimax', 'quantum', 'astar']
-
-    def run_large_simulations(self, game_type='ttt', games_per_matchup=10000):
+        self.batch_player_types = ['random', 'quantum']
+        self.engine = 'numpy'
+        self.use_batch = False
+        self.opening_book = None
+        self.move_cache = 0
+        self.move_cache_file = None
+
+    def run_large_simulations(self, game_type='ttt', games_per_matchup=10000, engine='numpy', use_batch=False,
+                              opening_book=None, move_cache=0, move_cache_file=None):
         """Run large simulations with all player type combinations"""
+        self.engine = engine
+        self.use_batch = use_batch
+        self.opening_book = opening_book
+        self.move_cache = move_cache
+        self.move_cache_file = move_cache_file
         print(f"Starting LARGE simulations for {game_type.upper()}")
         print(f"Testing {len(self.all_player_types)} player types")
         print(f"{games_per_matchup:,} games per matchup")
@@ -60,10 +72,19 @@ class LargeSimulationRunner:
                 self.no_graphics = True
 
         args = Args()
+        args.engine = self.engine
+        args.book1 = args.book2 = self.opening_book
+        # With a file, every matchup starts from the positions the earlier ones cached
+        args.move_cache = self.move_cache
+        args.move_cache_file = self.move_cache_file
 
         # Run simulation - this will automatically save results to CSV
         self.simulator = GameSimulator()
-        self.simulator.run_simulation(args)
+        if (self.use_batch and player1_type in self.batch_player_types
+                and player2_type in self.batch_player_types):
+            self.simulator.run_batch_simulation(args)
+        else:
+            self.simulator.run_simulation(args)
 
 
 def main():
@@ -75,11 +96,22 @@ def main():
                         help='Type of game to simulate (default: ttt)')
     parser.add_argument('-g', '--games', type=int, default=10000,
                         help='Number of games per matchup (default: 10000)')
+    parser.add_argument('-e', '--engine', choices=['numpy', 'bitboard'], default='numpy',
+                        help='Board representation for the games (default: numpy)')
+    parser.add_argument('-b', '--batch', action='store_true',
+                        help='Play random/quantum-only matchups on the vectorized batch engine')
+    parser.add_argument('--book', default=None,
+                        help='Opening book file for the minimax and A* players (see build_opening_book.py)')
+    parser.add_argument('--move_cache', type=int, default=0,
+                        help='Positions whose minimax/A* best moves are kept across games (default: 0, off)')
+    parser.add_argument('--move_cache_file', default=None,
+                        help='Move cache file shared by all matchups and later runs')
 
     args = parser.parse_args()
 
     runner = LargeSimulationRunner()
-    runner.run_large_simulations(args.game_type, args.games)
+    runner.run_large_simulations(args.game_type, args.games, args.engine, args.batch, args.book,
+                                 args.move_cache, args.move_cache_file)
 
 
 if __name__ == "__main__":
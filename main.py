@@ -5,50 +5,90 @@ import os
 import csv
 from datetime import datetime
 import random
+import numpy as np
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from games.tic_tac_toe import TicTacToe
+from games.tic_tac_toe_bitboard import BitboardTicTacToe
 from games.connect_four import ConnectFour
+from games.connect_four_bitboard import BitboardConnectFour
+from games.mnk_game import MNKGame
+from games.batch_game import BatchGame, BatchTicTacToe, BatchConnectFour
 from players.human_player import HumanPlayer
 from players.random_player import RandomPlayer
 from players.minimax_player import MinimaxPlayer
 from players.quantum_player import QuantumPlayer
 from players.astar_player import AStarPlayer
+from players.mcts_player import MCTSPlayer
+from players.move_cache import MoveCache
+from players.pondering import PonderingPlayer
 
 
 class GameSimulator:
     def __init__(self):
         self.results = []
+        self.player_stats = {1: {}, 2: {}}  # Search counters summed per command-line player
+        self.move_cache = None  # Best moves shared by the minimax/A* players of every game in a run
+
+    def create_game(self, game_type, engine='numpy', **game_options):
+        """game_options (rows, cols, connect, gravity, frontier_radius) only apply to mnk"""
+        if game_type.lower() == 'mnk':
+            if engine.lower() != 'numpy':
+                raise ValueError(f"Engine '{engine}' is not available for {game_type}")
+            return MNKGame(**game_options)
 
-    def create_game(self, game_type):
         game_map = {
-            'tictactoe': TicTacToe,
-            'connectfour': ConnectFour,
-            'ttt': TicTacToe,  # Short alias
-            'c4': ConnectFour  # Short alias
+            'tictactoe': {'numpy': TicTacToe, 'bitboard': BitboardTicTacToe},
+            'connectfour': {'numpy': ConnectFour, 'bitboard': BitboardConnectFour},
+            'ttt': {'numpy': TicTacToe, 'bitboard': BitboardTicTacToe},  # Short alias
+            'c4': {'numpy': ConnectFour, 'bitboard': BitboardConnectFour}  # Short alias
         }
 
-        game_class = game_map.get(game_type.lower())
+        engines = game_map.get(game_type.lower())
+        if not engines:
+            raise ValueError(f"Unknown game type: {game_type}")
+
+        game_class = engines.get(engine.lower())
         if game_class:
             return game_class()
+        else:
+            raise ValueError(f"Engine '{engine}' is not available for {game_type}")
+
+    def create_batch_game(self, game_type, num_games, **game_options):
+        if game_type.lower() == 'mnk':
+            return BatchGame(num_games, game_options.get('rows', 15), game_options.get('cols', 15),
+                             game_options.get('connect', 5), game_options.get('gravity', False))
+
+        batch_map = {
+            'tictactoe': BatchTicTacToe,
+            'connectfour': BatchConnectFour,
+            'ttt': BatchTicTacToe,  # Short alias
+            'c4': BatchConnectFour  # Short alias
+        }
+
+        batch_class = batch_map.get(game_type.lower())
+        if batch_class:
+            return batch_class(num_games)
         else:
             raise ValueError(f"Unknown game type: {game_type}")
 
-    def create_player(self, player_type, player_id, depth=None):
+    def create_player(self, player_type, player_id, depth=None, **player_options):
         player_map = {
             'human': HumanPlayer,
             'random': RandomPlayer,
             'minimax': MinimaxPlayer,
             'quantum': QuantumPlayer,
             'astar': AStarPlayer,
+            'mcts': MCTSPlayer,
             # Short aliases
             'h': HumanPlayer,
             'r': RandomPlayer,
             'mm': MinimaxPlayer,
             'q': QuantumPlayer,
-            'a': AStarPlayer
+            'a': AStarPlayer,
+            'mc': MCTSPlayer
         }
 
         player_class = player_map.get(player_type.lower())
@@ -56,13 +96,80 @@ class GameSimulator:
             if player_class in [MinimaxPlayer, AStarPlayer]:
                 if depth is None:
                     depth = 3  # Default depth
-                return player_class(player_id, depth)
+                if player_options.pop('ponder', False):
+                    # The background searcher runs serially and keeps no shared cache
+                    ponder_options = dict(player_options, move_cache=None)
+                    if 'workers' in ponder_options:
+                        ponder_options['workers'] = 1
+                    return PonderingPlayer(player_class(player_id, depth, **player_options),
+                                           player_class(player_id, depth, **ponder_options))
+                return player_class(player_id, depth, **player_options)
             else:
                 # For non-depth players, we still track depth for CSV but set to -1
-                return player_class(player_id)
+                return player_class(player_id, **player_options)
         else:
             raise ValueError(f"Unknown player type: {player_type}")
 
+    def get_game_options(self, args):
+        """Board configuration for mnk games; other game types take no options"""
+        if args.game_type.lower() != 'mnk':
+            return {}
+        return {
+            'rows': getattr(args, 'rows', 15),
+            'cols': getattr(args, 'cols', 15),
+            'connect': getattr(args, 'connect', 5),
+            'gravity': getattr(args, 'gravity', False),
+            'frontier_radius': getattr(args, 'frontier', 0)
+        }
+
+    def get_player_options(self, args, side):
+        """Extra constructor options for the player given as player{side}_type on the command line"""
+        player_type = getattr(args, f'player{side}_type').lower()
+        time_limit_ms = getattr(args, f'time{side}', 0)
+        if player_type in ('minimax', 'mm'):
+            return {'tt_size': getattr(args, f'tt_size{side}', 0), 'time_limit_ms': time_limit_ms,
+                    'shared_tt': getattr(args, f'shared_tt{side}', False),
+                    'move_ordering': getattr(args, f'ordering{side}', False),
+                    'workers': getattr(args, f'workers{side}', 1),
+                    'opening_book': getattr(args, f'book{side}', None),
+                    'endgame_threshold': getattr(args, f'endgame{side}', 0),
+                    'oracle': getattr(args, f'oracle{side}', False),
+                    'window_eval': getattr(args, f'window_eval{side}', False),
+                    'move_cache': self.move_cache,
+                    'threats': getattr(args, f'threats{side}', False),
+                    'ponder': getattr(args, f'ponder{side}', False)}
+        if player_type in ('astar', 'a'):
+            return {'time_limit_ms': time_limit_ms, 'node_budget': getattr(args, f'nodes{side}', 10000),
+                    'opening_book': getattr(args, f'book{side}', None),
+                    'oracle': getattr(args, f'oracle{side}', False),
+                    'move_cache': self.move_cache,
+                    'threats': getattr(args, f'threats{side}', False),
+                    'ponder': getattr(args, f'ponder{side}', False)}
+        if player_type in ('mcts', 'mc'):
+            return {'time_limit_ms': time_limit_ms, 'iterations': getattr(args, f'iterations{side}', 1000),
+                    'workers': getattr(args, f'workers{side}', 1)}
+        return {}
+
+    def add_player_stats(self, side, player):
+        totals = self.player_stats[side]
+        for name, value in player.get_stats().items():
+            if name.endswith('_max'):
+                totals[name] = max(totals.get(name, 0), value)
+            else:
+                totals[name] = totals.get(name, 0) + value
+
+    def search_depths(self, game, player1, player2):
+        """Depth reached on every move of a finished game, '-' for moves not made by a timed search"""
+        timed = {1: list(getattr(player1, 'depths_reached', [])), 2: list(getattr(player2, 'depths_reached', []))}
+        if not timed[1] and not timed[2]:
+            return None
+        depths = []
+        for ply in range(game.move_count):
+            moves = timed[1 + ply % 2]  # Player 1 always makes the first move
+            depth = moves.pop(0) if moves else '-'
+            depths.append('book' if depth is None else str(depth))
+        return ' '.join(depths)
+
     def play_game(self, game, player1, player2, show_graphics=True):
         players = {1: player1, 2: player2}
 
@@ -104,33 +211,44 @@ class GameSimulator:
         wins_player2 = 0
         draws = 0
 
-        print(f"Starting simulation: {args.game_type}")
+        engine = getattr(args, 'engine', 'numpy')
+        game_options = self.get_game_options(args)
+
+        print(f"Starting simulation: {args.game_type} ({engine} engine)")
+        if game_options:
+            print(f"Board: {game_options}")
         print(f"Player 1: {args.player1_type} (Depth: {args.depth1})")
         print(f"Player 2: {args.player2_type} (Depth: {args.depth2})")
         print(f"Games: {total_games}")
         print(f"First player: {args.first_player}")
 
+        if getattr(args, 'move_cache', 0) > 0:
+            self.move_cache = MoveCache(args.move_cache, getattr(args, 'move_cache_file', None))
+            if len(self.move_cache):
+                print(f"Move cache: {len(self.move_cache):,} positions loaded from {self.move_cache.path}")
+
         for game_num in range(total_games):
             # Determine who goes first
-            if args.first_player.lower()[0] == "r":
-                first_player = random.choice([1, 2])
-            else:
-                first_player = int(args.first_player)
+            first_player = self._choose_first_player(args)
 
             # Create game and players
-            game = self.create_game(args.game_type)
+            game = self.create_game(args.game_type, engine, **game_options)
 
             # Assign players based on who goes first with their respective depths
+            options1 = self.get_player_options(args, 1)
+            options2 = self.get_player_options(args, 2)
             if first_player == 1:
-                player1 = self.create_player(args.player1_type, 1, args.depth1)
-                player2 = self.create_player(args.player2_type, 2, args.depth2)
+                player1 = self.create_player(args.player1_type, 1, args.depth1, **options1)
+                player2 = self.create_player(args.player2_type, 2, args.depth2, **options2)
+                sides = {1: player1, 2: player2}
                 player1_depth = args.depth1
                 player2_depth = args.depth2
                 player1_type = args.player1_type
                 player2_type = args.player2_type
             else:
-                player1 = self.create_player(args.player2_type, 1, args.depth2)
-                player2 = self.create_player(args.player1_type, 2, args.depth1)
+                player1 = self.create_player(args.player2_type, 1, args.depth2, **options2)
+                player2 = self.create_player(args.player1_type, 2, args.depth1, **options1)
+                sides = {1: player2, 2: player1}
                 player1_depth = args.depth2
                 player2_depth = args.depth1
                 player1_type = args.player2_type
@@ -138,6 +256,12 @@ class GameSimulator:
 
             # Play the game
             result, winner = self.play_game(game, player1, player2, args.show_graphics)
+            player1.end_game()
+            player2.end_game()
+            move_record = game.move_record()
+            for side, player in sides.items():
+                self.add_player_stats(side, player)
+            search_depths = self.search_depths(game, player1, player2)
 
             # Get winner info
             winner_type = None
@@ -161,7 +285,10 @@ class GameSimulator:
                 'result': result,
                 'winner_type': winner_type,
                 'winner_depth': winner_depth,
-                'player1_went_first': (first_player == 1)
+                'player1_went_first': (first_player == 1),
+                'num_moves': game.move_count,
+                'moves': move_record,
+                'search_depths': search_depths
             }
 
             self.results.append(game_result)
@@ -180,10 +307,125 @@ class GameSimulator:
 
         # Print summary
         self.print_summary(wins_player1, wins_player2, draws, total_games)
+        self.print_player_stats(args)
+        if self.move_cache is not None:
+            print(f"\nMove cache: {len(self.move_cache):,} positions")
+            if self.move_cache.path:
+                self.move_cache.save()
+                print(f"Move cache saved to: {self.move_cache.path}")
 
         # Save results to CSV
         self.save_results(args)
 
+    def run_batch_simulation(self, args):
+        """Play all games in lockstep on a BatchGame; both players must support batched moves"""
+        total_games = args.num_games
+        batch_size = min(getattr(args, 'batch_size', 1024), total_games)
+        wins_player1 = 0
+        wins_player2 = 0
+        draws = 0
+
+        print(f"Starting batched simulation: {args.game_type} ({batch_size} games in lockstep)")
+        print(f"Player 1: {args.player1_type} (Depth: {args.depth1})")
+        print(f"Player 2: {args.player2_type} (Depth: {args.depth2})")
+        print(f"Games: {total_games}")
+        print(f"First player: {args.first_player}")
+
+        # Batch policies do not depend on the player id, so one instance per type is enough
+        type1_player = self.create_player(args.player1_type, 1, args.depth1)
+        type2_player = self.create_player(args.player2_type, 2, args.depth2)
+        for player in (type1_player, type2_player):
+            if not player.supports_batch:
+                raise ValueError(f"{player.__class__.__name__} does not support batched games")
+
+        env = self.create_batch_game(args.game_type, batch_size, **self.get_game_options(args))
+        slot_game = np.zeros(batch_size, dtype=int)  # Game number played in each slot
+        slot_first = np.zeros(batch_size, dtype=int)  # Which of the two player types moves first
+        games_started = 0
+
+        for slot in range(batch_size):
+            slot_game[slot] = games_started
+            slot_first[slot] = self._choose_first_player(args)
+            games_started += 1
+
+        while env.active.any():
+            valid_mask = env.valid_move_mask()
+
+            # player1_type holds id 1 in the slots where it moves first
+            type1_to_move = env.current_player == np.where(slot_first == 1, 1, 2)
+            actions = np.zeros(batch_size, dtype=np.intp)
+            for player, to_move in ((type1_player, type1_to_move), (type2_player, ~type1_to_move)):
+                slots = np.flatnonzero(to_move & env.active)
+                if len(slots):
+                    actions[slots] = player.get_batch_moves(valid_mask[slots])
+
+            finished, winners = env.step(actions)
+
+            for slot in np.flatnonzero(finished):
+                first_player = int(slot_first[slot])
+                if first_player == 1:
+                    player1_depth = args.depth1
+                    player2_depth = args.depth2
+                    player1_type = args.player1_type
+                    player2_type = args.player2_type
+                else:
+                    player1_depth = args.depth2
+                    player2_depth = args.depth1
+                    player1_type = args.player2_type
+                    player2_type = args.player1_type
+
+                winner_id = int(winners[slot])
+                num_moves, move_record = env.finished_games[slot]
+                result = "draw" if winner_id == 0 else "win"
+                winner_type = None
+                winner_depth = None
+                if winner_id == 1:
+                    winner_type = player1_type
+                    winner_depth = player1_depth
+                    wins_player1 += 1
+                elif winner_id == 2:
+                    winner_type = player2_type
+                    winner_depth = player2_depth
+                    wins_player2 += 1
+                else:
+                    draws += 1
+
+                self.results.append({
+                    'game_number': int(slot_game[slot]) + 1,
+                    'first_player': first_player,
+                    'player1_type': player1_type,
+                    'player2_type': player2_type,
+                    'player1_depth': player1_depth,
+                    'player2_depth': player2_depth,
+                    'result': result,
+                    'winner_type': winner_type,
+                    'winner_depth': winner_depth,
+                    'player1_went_first': (first_player == 1),
+                    'num_moves': num_moves,
+                    'moves': move_record
+                })
+
+                # The finished slot was already reset; start the next game or retire it
+                if games_started < total_games:
+                    slot_game[slot] = games_started
+                    slot_first[slot] = self._choose_first_player(args)
+                    games_started += 1
+                else:
+                    env.active[slot] = False
+
+        self.results.sort(key=lambda r: r['game_number'])
+
+        # Print summary
+        self.print_summary(wins_player1, wins_player2, draws, total_games)
+
+        # Save results to CSV
+        self.save_results(args)
+
+    def _choose_first_player(self, args):
+        if args.first_player.lower()[0] == "r":
+            return random.choice([1, 2])
+        return int(args.first_player)
+
     def print_summary(self, wins_player1, wins_player2, draws, total_games):
         print("\n" + "=" * 50)
         print("SIMULATION SUMMARY")
@@ -215,13 +457,51 @@ class GameSimulator:
             print(f"First player wins: {first_player_wins} ({first_player_wins / total_with_first * 100:.1f}%)")
             print(f"Second player wins: {second_player_wins} ({second_player_wins / total_with_first * 100:.1f}%)")
 
+    def print_player_stats(self, args):
+        for side in (1, 2):
+            stats = self.player_stats[side]
+            if not stats:
+                continue
+            player_type = getattr(args, f'player{side}_type')
+            print(f"\nSearch statistics for player {side} ({player_type}):")
+            for name, value in stats.items():
+                if '_pid' not in name:
+                    print(f"{name}: {value:,}")
+            probes = stats.get('tt_hits', 0) + stats.get('tt_misses', 0)
+            if probes:
+                print(f"tt_hit_rate: {stats['tt_hits'] / probes * 100:.1f}%")
+            # Per-process counts of a shared transposition table
+            for name in stats:
+                if name.startswith('tt_hits_pid'):
+                    pid = name[len('tt_hits_pid'):]
+                    probes = stats[name] + stats.get(f'tt_misses_pid{pid}', 0)
+                    if probes:
+                        print(f"tt_hit_rate_pid{pid}: {stats[name] / probes * 100:.1f}% of {probes:,} probes")
+            lookups = stats.get('cache_hits', 0) + stats.get('cache_misses', 0)
+            if lookups:
+                print(f"cache_hit_rate: {stats['cache_hits'] / lookups * 100:.1f}%")
+            if stats.get('searched_moves'):
+                for name in ('nodes', 'nodes_expanded', 'playouts'):
+                    if name in stats:
+                        print(f"{name}_per_move: {stats[name] / stats['searched_moves']:,.0f}")
+            pondered = stats.get('ponder_hits', 0) + stats.get('ponder_misses', 0)
+            if pondered:
+                print(f"ponder_hit_rate: {stats['ponder_hits'] / pondered * 100:.1f}%")
+            if stats.get('ponder_hits'):
+                print(f"ponder_ms_saved_per_hit: {stats['ponder_saved_ms'] / stats['ponder_hits']:,.1f}")
+            if stats.get('endgame_solves'):
+                print(f"endgame_ms_per_solve: {stats['endgame_solve_ms'] / stats['endgame_solves']:,.1f}")
+            if stats.get('timed_moves'):
+                print(f"average_depth_reached: {stats['depth_reached_total'] / stats['timed_moves']:.2f}")
+
     def save_results(self, args):
         # Create data directory for specific game type
         game_dir_map = {
             'tictactoe': 'ttt',
             'ttt': 'ttt',
             'connectfour': 'c4',
-            'c4': 'c4'
+            'c4': 'c4',
+            'mnk': 'mnk'
         }
         game_subdir = game_dir_map.get(args.game_type.lower(), 'other')
         data_dir = os.path.join("data", game_subdir)
@@ -248,7 +528,10 @@ class GameSimulator:
                 'loser_player_number',
                 'loser_player_type',
                 'loser_depth',
-                'was_draw'
+                'was_draw',
+                'num_moves',
+                'moves',
+                'search_depths'
             ]
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
 
@@ -321,7 +604,10 @@ class GameSimulator:
                     'loser_player_number': loser_player_number,
                     'loser_player_type': loser_player_type,
                     'loser_depth': loser_depth,
-                    'was_draw': was_draw
+                    'was_draw': was_draw,
+                    'num_moves': result.get('num_moves'),
+                    'moves': result.get('moves'),
+                    'search_depths': result.get('search_depths')
                 }
                 writer.writerow(row_data)
 
@@ -333,14 +619,16 @@ def main():
 
     # Required arguments
     parser.add_argument('game_type',
-                        choices=['tictactoe', 'connectfour', 'ttt', 'c4'],
-                        help='Type of game to play (tictactoe/ttt, connectfour/c4)')
+                        choices=['tictactoe', 'connectfour', 'ttt', 'c4', 'mnk'],
+                        help='Type of game to play (tictactoe/ttt, connectfour/c4, mnk)')
     parser.add_argument('player1_type',
-                        choices=['human', 'random', 'minimax', 'quantum', 'astar', 'h', 'r', 'mm', 'q', 'a'],
-                        help='Type of player 1 (human/h, random/r, minimax/mm, quantum/q, astar/a)')
+                        choices=['human', 'random', 'minimax', 'quantum', 'astar', 'mcts',
+                                 'h', 'r', 'mm', 'q', 'a', 'mc'],
+                        help='Type of player 1 (human/h, random/r, minimax/mm, quantum/q, astar/a, mcts/mc)')
     parser.add_argument('player2_type',
-                        choices=['human', 'random', 'minimax', 'quantum', 'astar', 'h', 'r', 'mm', 'q', 'a'],
-                        help='Type of player 2 (human/h, random/r, minimax/mm, quantum/q, astar/a)')
+                        choices=['human', 'random', 'minimax', 'quantum', 'astar', 'mcts',
+                                 'h', 'r', 'mm', 'q', 'a', 'mc'],
+                        help='Type of player 2 (human/h, random/r, minimax/mm, quantum/q, astar/a, mcts/mc)')
 
     # Optional arguments with short versions
     parser.add_argument('-f', '--first_player',
@@ -352,17 +640,106 @@ def main():
                         help='Depth for player 1 minimax and A* algorithms (default: 3)')
     parser.add_argument('-d2', '--depth2', type=int, default=3,
                         help='Depth for player 2 minimax and A* algorithms (default: 3)')
+    parser.add_argument('-tt1', '--tt_size1', type=int, default=0,
+                        help='Transposition table entries for a player 1 minimax search (default: 0, disabled)')
+    parser.add_argument('-tt2', '--tt_size2', type=int, default=0,
+                        help='Transposition table entries for a player 2 minimax search (default: 0, disabled)')
+    parser.add_argument('--shared_tt1', action='store_true',
+                        help='Keep the player 1 transposition table in shared memory, used by all of its workers')
+    parser.add_argument('--shared_tt2', action='store_true',
+                        help='Keep the player 2 transposition table in shared memory, used by all of its workers')
+    parser.add_argument('--time1', type=float, default=0,
+                        help='Per-move time budget in ms for player 1 minimax/A*/MCTS; replaces --depth1, '
+                             '--nodes1 and --iterations1 (default: 0, no time limit)')
+    parser.add_argument('--time2', type=float, default=0,
+                        help='Per-move time budget in ms for player 2 minimax/A*/MCTS (default: 0, no time limit)')
+    parser.add_argument('--nodes1', type=int, default=10000,
+                        help='Maximum positions player 1 A* expands per move (default: 10000)')
+    parser.add_argument('--nodes2', type=int, default=10000,
+                        help='Maximum positions player 2 A* expands per move (default: 10000)')
+    parser.add_argument('--iterations1', type=int, default=1000,
+                        help='Playouts per move (per worker) for a player 1 MCTS (default: 1000)')
+    parser.add_argument('--iterations2', type=int, default=1000,
+                        help='Playouts per move (per worker) for a player 2 MCTS (default: 1000)')
+    parser.add_argument('--workers1', type=int, default=1,
+                        help='Processes for a root-parallel player 1 minimax/MCTS (default: 1, serial)')
+    parser.add_argument('--workers2', type=int, default=1,
+                        help='Processes for a root-parallel player 2 minimax/MCTS (default: 1, serial)')
+    parser.add_argument('--book1', default=None,
+                        help='Opening book file (see build_opening_book.py) for a player 1 minimax/A*')
+    parser.add_argument('--book2', default=None,
+                        help='Opening book file (see build_opening_book.py) for a player 2 minimax/A*')
+    parser.add_argument('--endgame1', type=int, default=0,
+                        help='Solve exactly once at most this many cells are empty, player 1 minimax (default: 0, off)')
+    parser.add_argument('--endgame2', type=int, default=0,
+                        help='Solve exactly once at most this many cells are empty, player 2 minimax (default: 0, off)')
+    parser.add_argument('--oracle1', action='store_true',
+                        help='Player 1 minimax/A* plays Tic Tac Toe perfectly from a solved table')
+    parser.add_argument('--oracle2', action='store_true',
+                        help='Player 2 minimax/A* plays Tic Tac Toe perfectly from a solved table')
+    parser.add_argument('--ordering1', action='store_true',
+                        help='Order player 1 minimax moves center-first with killer moves and a history table')
+    parser.add_argument('--ordering2', action='store_true',
+                        help='Order player 2 minimax moves center-first with killer moves and a history table')
+    parser.add_argument('--window_eval1', action='store_true',
+                        help='Score player 1 minimax leaves by open windows, updated incrementally per move')
+    parser.add_argument('--window_eval2', action='store_true',
+                        help='Score player 2 minimax leaves by open windows, updated incrementally per move')
+    parser.add_argument('--threats1', action='store_true',
+                        help='Player 1 minimax/A* takes immediate wins, plays forced blocks and prunes unsafe moves')
+    parser.add_argument('--threats2', action='store_true',
+                        help='Player 2 minimax/A* takes immediate wins, plays forced blocks and prunes unsafe moves')
+    parser.add_argument('--ponder1', action='store_true',
+                        help="Player 1 minimax/A* searches the likely replies in a background thread on the opponent's time")
+    parser.add_argument('--ponder2', action='store_true',
+                        help="Player 2 minimax/A* searches the likely replies in a background thread on the opponent's time")
+    parser.add_argument('--move_cache', type=int, default=0,
+                        help='Positions whose minimax/A* best moves are kept across games (default: 0, off)')
+    parser.add_argument('--move_cache_file', default=None,
+                        help='Load the move cache from this file if it exists and save it after the run')
     parser.add_argument('-ng', '--no_graphics', action='store_true',
                         help='Turn off game graphics')
+    parser.add_argument('--rows', type=int, default=15,
+                        help='Board rows for mnk games (default: 15)')
+    parser.add_argument('--cols', type=int, default=15,
+                        help='Board columns for mnk games (default: 15)')
+    parser.add_argument('-k', '--connect', type=int, default=5,
+                        help='Pieces in a row needed to win mnk games (default: 5)')
+    parser.add_argument('--gravity', action='store_true',
+                        help='Pieces fall to the lowest empty cell of a column in mnk games')
+    parser.add_argument('--frontier', type=int, default=0,
+                        help='Only offer mnk moves within this distance of a piece (default: 0, all empty cells)')
+    parser.add_argument('-b', '--batch', action='store_true',
+                        help='Play all games in lockstep on a vectorized board batch (random/quantum players only)')
+    parser.add_argument('--batch_size', type=int, default=1024,
+                        help='Number of games played simultaneously with --batch (default: 1024)')
+    parser.add_argument('-e', '--engine',
+                        choices=['numpy', 'bitboard'], default='numpy',
+                        help='Board representation: numpy array or bitboard (default: numpy)')
 
     args = parser.parse_args()
 
+    # Fail fast if the engine is not implemented for this game
+    try:
+        simulator = GameSimulator()
+        simulator.create_game(args.game_type, args.engine, **simulator.get_game_options(args))
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.batch:
+        for player_type in (args.player1_type, args.player2_type):
+            if not GameSimulator().create_player(player_type, 1).supports_batch:
+                parser.error(f"Player type '{player_type}' cannot play batched games")
+
     # Set graphics flag
     args.show_graphics = not args.no_graphics
 
     # Create and run simulator
     simulator = GameSimulator()
-    simulator.run_simulation(args)
+    if args.batch:
+        simulator.run_batch_simulation(args)
+    else:
+        simulator.run_simulation(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+import argparse
+import time
+from multiprocessing import Pool
+
+from main import GameSimulator
+
+DEFAULT_DEPTHS = {'tictactoe': 9, 'ttt': 9, 'connectfour': 6, 'c4': 6}
+
+# Full-tree totals for Tic Tac Toe, used by --check
+TIC_TAC_TOE_GAMES = 255168
+TIC_TAC_TOE_RESULTS = {1: 131184, 2: 77904, 0: 46080}
+
+
+class PerftStats:
+    """Node counts collected while walking a game tree"""
+
+    def __init__(self, depth):
+        self.nodes = [0] * (depth + 1)  # Positions reached at each ply
+        self.terminals = [0] * (depth + 1)  # Finished games at each ply
+        self.results = {1: 0, 2: 0, 0: 0}  # Finished games by winner (0 = draw)
+        self.leaves = 0  # Finished games plus unfinished positions at full depth
+
+    @property
+    def total_nodes(self):
+        return sum(self.nodes)
+
+    @property
+    def total_terminals(self):
+        return sum(self.terminals)
+
+    def merge(self, other):
+        for ply in range(len(self.nodes)):
+            self.nodes[ply] += other.nodes[ply]
+            self.terminals[ply] += other.terminals[ply]
+        for winner in self.results:
+            self.results[winner] += other.results[winner]
+        self.leaves += other.leaves
+
+    def summary(self):
+        return (self.nodes, self.terminals, self.results, self.leaves)
+
+
+def perft(game, depth, stats, ply=0):
+    """Enumerate every line from `game` down to `depth` plies, searching in place"""
+    stats.nodes[ply] += 1
+    if game.game_over:
+        stats.terminals[ply] += 1
+        stats.results[int(game.winner)] += 1
+        stats.leaves += 1
+        return
+    if ply == depth:
+        stats.leaves += 1
+        return
+
+    for move in game.get_valid_moves():
+        game.make_move(move)
+        perft(game, depth, stats, ply + 1)
+        game.undo_move()
+
+
+def _perft_root_move(task):
+    """Worker: count the subtree below one root move"""
+    game_type, engine, move, depth = task
+    game = GameSimulator().create_game(game_type, engine)
+    stats = PerftStats(depth)
+    game.make_move(move)
+    perft(game, depth, stats, 1)
+    return move, stats
+
+
+class PerftRunner:
+    def __init__(self, game_type, engine='numpy', processes=1):
+        self.game_type = game_type
+        self.engine = engine
+        self.processes = processes
+        self.pool = Pool(processes) if processes > 1 else None
+
+    def run(self, depth, divide=False):
+        """
+        Count the tree to `depth`; returns (stats, per-root-move stats, seconds).
+        The tree is split by root move when there is a pool or `divide` asks for
+        the per-move counts, otherwise the per-move stats are empty.
+        """
+        game = GameSimulator().create_game(self.game_type, self.engine)
+        start = time.perf_counter()
+
+        if depth == 0 or (self.pool is None and not divide):
+            stats = PerftStats(depth)
+            perft(game, depth, stats)
+            divide = {}
+        else:
+            stats = PerftStats(depth)
+            stats.nodes[0] = 1
+            tasks = [(self.game_type, self.engine, move, depth) for move in game.get_valid_moves()]
+            mapper = self.pool.map if self.pool is not None else map
+            divide = dict(mapper(_perft_root_move, tasks))
+            for move_stats in divide.values():
+                stats.merge(move_stats)
+
+        return stats, divide, time.perf_counter() - start
+
+    def run_table(self, max_depth, divide=False):
+        """Run perft for every depth up to max_depth and print throughput per depth"""
+        print(f"Perft: {self.game_type} ({self.engine} engine, {self.processes} process(es))")
+        print(f"{'Depth':>5} {'Nodes at ply':>14} {'Total nodes':>14} {'Leaves':>14} "
+              f"{'Finished':>12} {'Time (s)':>10} {'Nodes/s':>12}")
+
+        stats = None
+        for depth in range(1, max_depth + 1):
+            stats, per_move, elapsed = self.run(depth, divide)
+            nodes_per_second = stats.total_nodes / elapsed if elapsed > 0 else float('inf')
+            print(f"{depth:>5} {stats.nodes[depth]:>14,} {stats.total_nodes:>14,} {stats.leaves:>14,} "
+                  f"{stats.total_terminals:>12,} {elapsed:>10.3f} {nodes_per_second:>12,.0f}")
+
+        print(f"\nFinished games: {stats.total_terminals:,} "
+              f"(player 1 wins: {stats.results[1]:,}, player 2 wins: {stats.results[2]:,}, "
+              f"draws: {stats.results[0]:,})")
+
+        if divide and per_move:
+            print("\nLeaves per root move:")
+            for move, move_stats in per_move.items():
+                print(f"  {move}: {move_stats.leaves:,}")
+        return stats
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count game tree nodes (perft) and benchmark move generation')
+    parser.add_argument('game_type',
+                        choices=['tictactoe', 'connectfour', 'ttt', 'c4'],
+                        help='Type of game to enumerate')
+    parser.add_argument('-d', '--depth', type=int, default=None,
+                        help='Maximum depth in plies (default: 9 for ttt, 6 for c4)')
+    parser.add_argument('-e', '--engine', choices=['numpy', 'bitboard', 'all'], default='numpy',
+                        help='Engine to enumerate; "all" runs every engine and compares the counts (default: numpy)')
+    parser.add_argument('-p', '--processes', type=int, default=1,
+                        help='Split the root moves across this many processes (default: 1)')
+    parser.add_argument('--divide', action='store_true',
+                        help='Show leaf counts per root move at the maximum depth')
+    parser.add_argument('--check', action='store_true',
+                        help='Verify the full Tic Tac Toe tree against the known 255,168 games')
+
+    args = parser.parse_args()
+    depth = args.depth if args.depth is not None else DEFAULT_DEPTHS[args.game_type]
+    if depth < 1:
+        parser.error("--depth must be at least 1")
+    engines = ['numpy', 'bitboard'] if args.engine == 'all' else [args.engine]
+
+    summaries = {}
+    for engine in engines:
+        runner = PerftRunner(args.game_type, engine, args.processes)
+        try:
+            stats = runner.run_table(depth, args.divide)
+        finally:
+            runner.close()
+        summaries[engine] = stats.summary()
+        print()
+
+    ok = True
+    if len(summaries) > 1:
+        if all(summary == summaries[engines[0]] for summary in summaries.values()):
+            print("Engines agree on every count")
+        else:
+            print("MISMATCH: engines produced different counts")
+            ok = False
+
+    if args.check:
+        if args.game_type not in ('tictactoe', 'ttt') or depth < 9:
+            parser.error("--check needs the full Tic Tac Toe tree (ttt with depth >= 9)")
+        for engine, (nodes, terminals, results, leaves) in summaries.items():
+            if sum(terminals) == TIC_TAC_TOE_GAMES and results == TIC_TAC_TOE_RESULTS:
+                print(f"{engine}: matches the known {TIC_TAC_TOE_GAMES:,} Tic Tac Toe games")
+            else:
+                print(f"{engine}: MISMATCH, expected {TIC_TAC_TOE_GAMES:,} games {TIC_TAC_TOE_RESULTS}")
+                ok = False
+
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,165 +1,286 @@
+from games.tic_tac_toe import TicTacToe
 from .base_player import BasePlayer
+from .iterative_deepening import Deadline, max_search_depth
+from .evaluation import leaf_evaluator
+from .opening_book import load_opening_book
+from .tic_tac_toe_oracle import tic_tac_toe_oracle
+from .threats import find_threats, threat_moves
+import heapq
 import random
-import math
+
+
+class SearchNode:
+    """One position in the best-first search tree; positions reached by several lines share a node"""
+    __slots__ = ('key', 'ply', 'line', 'to_move', 'h', 'value', 'terminal', 'children', 'parents')
+
+    def __init__(self, key, ply, line, to_move, terminal=False):
+        self.key = key
+        self.ply = ply  # g(n): plies below the search root
+        self.line = line  # Moves from the search root to this position
+        self.to_move = to_move
+        self.h = 0  # Heuristic from the searching player's view
+        self.value = 0  # Minimax value backed up through the expanded tree
+        self.terminal = terminal
+        self.children = None  # move -> SearchNode once expanded (closed)
+        self.parents = []
 
 
 class AStarPlayer(BasePlayer):
-    def __init__(self, player_id: int, depth: int = 3):
+    """
+    Best-first (A*) search over the game tree.
+
+    The open list is a heap of unexpanded positions ordered by
+    f(n) = g(n) + h(n), where g is the number of plies below the root and h
+    is the heuristic negated from the view of the player who moved into n,
+    so the lines either side is most likely to choose are expanded first.
+    Expanded positions form a closed set keyed by position_key, so
+    transpositions are expanded once. Values are backed up minimax-style
+    after every expansion.
+
+    The search stops after node_budget expansions (or time_limit_ms) and
+    never expands below `depth` plies; depth 1 just scores the children.
+    With reuse_tree the explored subtree below the position actually
+    reached is kept for the next move.
+    """
+
+    def __init__(self, player_id: int, depth: int = 3, time_limit_ms: float = 0, node_budget: int = 10000,
+                 reuse_tree: bool = True, opening_book: str = None, oracle: bool = False, move_cache=None,
+                 threats: bool = False):
         super().__init__(player_id)
         self.depth = depth
+        # With a time limit the search expands until the budget runs out and `depth`/`node_budget` are ignored
+        self.time_limit_ms = time_limit_ms
+        self.node_budget = node_budget
+        self.reuse_tree = reuse_tree
+        self.depths_reached = []  # Deepest ply scored per timed move, None for book moves
+        self.deadline = None  # Set from outside to stop a search early, e.g. when pondering
+        self.leaf_evaluator = None  # Incremental window counts for scoring new children, built on first use
+        self.tree = {}  # position_key -> SearchNode, kept between moves with reuse_tree
+        self.nodes_expanded = 0
+        self.peak_open_list = 0
+        self.peak_tree_size = 0
+        self.searched_moves = 0
+        # Book positions are answered without searching
+        self.opening_book = load_opening_book(opening_book) if opening_book else None
+        self.book_hits = 0
+        # Tic Tac Toe moves come from the solved table instead of a search
+        self.oracle = oracle
+        self.oracle_hits = 0
+        # MoveCache shared across games; budgeted (untimed) results are looked up before searching
+        self.move_cache = move_cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Immediate wins and single forced blocks are played at once, and expansions
+        # only create children for wins, forced blocks or moves not under an opponent threat
+        self.threats = threats
+        self.forced_moves = 0
+        self.threat_pruned = 0
 
     def get_move(self, game):
-        valid_moves = game.get_valid_moves()
-
-        if game.__class__.__name__ == "TicTacToe":
-            return self._astar_tic_tac_toe(game, valid_moves)
+        if self.oracle and isinstance(game, TicTacToe):
+            self.oracle_hits += 1
+            if self.time_limit_ms > 0:
+                self.depths_reached.append(None)
+            return random.choice(tic_tac_toe_oracle().best_moves(game))
+
+        if self.opening_book is not None:
+            entry = self.opening_book.probe(game)
+            if entry is not None:
+                self.book_hits += 1
+                if self.time_limit_ms > 0:
+                    self.depths_reached.append(None)  # Keeps search_depths aligned with the moves
+                return random.choice(entry[1])
+
+        if self.threats:
+            wins, blocks, _ = find_threats(game)
+            forced = wins or (blocks if len(blocks) == 1 else None)
+            if forced:
+                self.forced_moves += 1
+                if self.time_limit_ms > 0:
+                    self.depths_reached.append(None)
+                return random.choice(forced)
+
+        cache_key = None
+        if self.move_cache is not None and self.time_limit_ms <= 0:
+            cache_key = self.move_cache.key(game, self.cache_config())
+            cached_moves = self.move_cache.get(cache_key)
+            if cached_moves is not None:
+                self.cache_hits += 1
+                return random.choice(cached_moves)
+            self.cache_misses += 1
+            # What gets stored must not depend on the tree left by earlier moves, so search from scratch
+            self.tree = {}
+
+        root, open_list = self._reroot(game)
+        self.searched_moves += 1
+
+        if self.time_limit_ms > 0:
+            deadline = Deadline(self.time_limit_ms, stop=self.deadline)
+            depth_limit = max_search_depth(game) + 1
+            budget = None
         else:
-            return self._astar_connect_four(game, valid_moves)
-
-    def _astar_tic_tac_toe(self, game, valid_moves):
-        best_score = float('-inf')
-        best_moves = []
-
-        for move in valid_moves:
-            # Make a copy of the game state
-            game_copy = type(game)()
-            game_copy.board = game.board.copy()
-            game_copy.current_player = game.current_player
-
-            game_copy.make_move(move)
-
-            # A* evaluation: f(n) = g(n) + h(n)
-            g_cost = 0  # Depth cost (we want to win quickly)
-            h_cost = self._heuristic_evaluation(game_copy)
-            score = h_cost - g_cost  # Higher score is better
-
-            if score > best_score:
-                best_score = score
-                best_moves = [move]
-            elif score == best_score:
-                best_moves.append(move)
-
+            deadline = self.deadline
+            depth_limit = max(1, self.depth)
+            budget = max(1, self.node_budget)
+
+        counter = len(open_list)  # Tie-breaker so the heap never compares nodes
+        expanded = 0
+        deepest = 0
+        while open_list:
+            # The root is always expanded so there is a move to play
+            if root.children is not None:
+                if budget is not None and expanded >= budget:
+                    break
+                if deadline is not None and deadline.expired():
+                    break
+            _, _, node = heapq.heappop(open_list)
+            if node.children is not None:
+                continue  # Closed while this entry waited in the heap
+
+            for child in self._expand(game, node):
+                if not child.terminal and child.ply < depth_limit:
+                    counter += 1
+                    heapq.heappush(open_list, (self._priority(child), counter, child))
+            self._backup(node)
+            expanded += 1
+            deepest = max(deepest, node.ply + 1)
+            self.peak_open_list = max(self.peak_open_list, len(open_list))
+
+        self.nodes_expanded += expanded
+        self.peak_tree_size = max(self.peak_tree_size, len(self.tree))
+        if self.time_limit_ms > 0:
+            self.depths_reached.append(deepest)
+
+        best_value = max(child.value for child in root.children.values())
+        best_moves = [move for move, child in root.children.items() if child.value == best_value]
+        if cache_key is not None:
+            self.move_cache.put(cache_key, best_moves)
         return random.choice(best_moves)
 
-    def _astar_connect_four(self, game, valid_moves):
-        best_score = float('-inf')
-        best_moves = []
-
-        for move in valid_moves:
-            game_copy = type(game)()
-            game_copy.board = game.board.copy()
-            game_copy.current_player = game.current_player
-
-            game_copy.make_move(move)
-
-            g_cost = 0  # Depth cost
-            h_cost = self._heuristic_evaluation(game_copy)
-            score = h_cost - g_cost
-
-            if score > best_score:
-                best_score = score
-                best_moves = [move]
-            elif score == best_score:
-                best_moves.append(move)
-
-        return random.choice(best_moves)
+    def cache_config(self):
+        """Settings that decide the result of a budgeted search, part of the move cache key"""
+        return 'astar', self.depth, self.node_budget, self.threats
+
+    def _priority(self, node):
+        # Lower is expanded first: f(n) = g(n) + h(n) with h = -heuristic for the player who moved into n
+        h_mover = node.h if node.to_move != self.player_id else -node.h
+        return node.ply - h_mover
+
+    def _reroot(self, game):
+        """Root node for the current position and the open list of its unexpanded descendants"""
+        key = game.position_key
+        root = self.tree.get(key) if self.reuse_tree else None
+        if root is None:
+            root = SearchNode(key, 0, (), game.current_player)
+        root.ply = 0
+        root.line = ()
+        root.parents = []
+
+        # Keep only what is reachable from the new root, renumbering plies and lines from it
+        tree = {key: root}
+        stack = [root]
+        open_list = []
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                if not node.terminal:
+                    open_list.append((self._priority(node), len(open_list), node))
+                continue
+            for move, child in node.children.items():
+                if child.key not in tree:
+                    tree[child.key] = child
+                    child.ply = node.ply + 1
+                    child.line = node.line + (move,)
+                    child.parents = []
+                    stack.append(child)
+                child.parents.append(node)
+
+        self.tree = tree
+        depth_limit = max_search_depth(game) + 1 if self.time_limit_ms > 0 else max(1, self.depth)
+        open_list = [entry for entry in open_list if entry[2].ply < depth_limit or entry[2] is root]
+        heapq.heapify(open_list)
+        return root, open_list
+
+    def _expand(self, game, node):
+        """Create the children of `node`; returns the ones that are new to the tree"""
+        for move in node.line:
+            game.make_move(move)
+
+        if self.leaf_evaluator is None:
+            self.leaf_evaluator = leaf_evaluator(game, self.player_id)
+
+        moves = game.get_valid_moves()
+        if self.threats:
+            searched_moves = threat_moves(game, moves)
+            self.threat_pruned += len(moves) - len(searched_moves)
+            moves = searched_moves
+
+        children = {}
+        created = []
+        for move in moves:
+            game.make_move(move)
+            key = game.position_key
+            child = self.tree.get(key)
+            if child is None:
+                child = SearchNode(key, node.ply + 1, node.line + (move,), game.current_player, game.game_over)
+                if game.game_over:
+                    child.h = child.value = self._heuristic_evaluation(game)
+                else:
+                    # Only the windows through the new piece (and the line to `node`) are rescored
+                    child.h = child.value = self.leaf_evaluator.sync(game)
+                self.tree[key] = child
+                created.append(child)
+            child.parents.append(node)
+            children[move] = child
+            game.undo_move()
+
+        for _ in node.line:
+            game.undo_move()
+        node.children = children
+        return created
+
+    def _backup(self, node):
+        """Recompute minimax values from `node` upwards while they change"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            values = [child.value for child in current.children.values()]
+            value = max(values) if current.to_move == self.player_id else min(values)
+            if value != current.value or current is node:
+                current.value = value
+                stack.extend(current.parents)
+
+    def get_stats(self):
+        if not (self.searched_moves or self.book_hits or self.oracle_hits or self.cache_hits or self.forced_moves):
+            return {}
+        stats = {
+            'nodes_expanded': self.nodes_expanded,
+            'searched_moves': self.searched_moves,
+            'open_list_max': self.peak_open_list,
+            'tree_size_max': self.peak_tree_size
+        }
+        if self.opening_book is not None:
+            stats['book_hits'] = self.book_hits
+        if self.oracle:
+            stats['oracle_hits'] = self.oracle_hits
+        if self.move_cache is not None:
+            stats['cache_hits'] = self.cache_hits
+            stats['cache_misses'] = self.cache_misses
+        if self.threats:
+            stats['forced_moves'] = self.forced_moves
+            stats['threat_pruned'] = self.threat_pruned
+        depths_reached = [depth for depth in self.depths_reached if depth is not None]
+        if depths_reached:
+            stats['timed_moves'] = len(depths_reached)
+            stats['depth_reached_total'] = sum(depths_reached)
+            stats['depth_reached_max'] = max(depths_reached)
+        return stats
 
     def _heuristic_evaluation(self, game):
-        """Heuristic evaluation function for A* algorithm"""
-        if game.game_over:
-            if game.winner == self.player_id:
-                return 1000  # Win
-            elif game.winner == 3 - self.player_id:
-                return -1000  # Loss
-            else:
-                return 0  # Draw
-
-        score = 0
-
-        if game.__class__.__name__ == "TicTacToe":
-            score = self._evaluate_tic_tac_toe(game)
+        """Score of a finished game; unfinished positions are scored by the leaf evaluator"""
+        if game.winner == self.player_id:
+            return 1000  # Win
+        elif game.winner == 3 - self.player_id:
+            return -1000  # Loss
         else:
-            score = self._evaluate_connect_four(game)
-
-        return score
-
-    def _evaluate_tic_tac_toe(self, game):
-        score = 0
-
-        # Evaluate rows, columns, and diagonals
-        lines = []
-
-        # Rows
-        for i in range(3):
-            lines.append([game.board[i, j] for j in range(3)])
-
-        # Columns
-        for j in range(3):
-            lines.append([game.board[i, j] for i in range(3)])
-
-        # Diagonals
-        lines.append([game.board[i, i] for i in range(3)])
-        lines.append([game.board[i, 2 - i] for i in range(3)])
-
-        for line in lines:
-            score += self._evaluate_line(line)
-
-        # Center control
-        if game.board[1, 1] == self.player_id:
-            score += 3
-        elif game.board[1, 1] == 3 - self.player_id:
-            score -= 3
-
-        return score
-
-    def _evaluate_connect_four(self, game):
-        score = 0
-
-        # Evaluate all possible 4-in-a-row sequences
-        for row in range(game.rows):
-            for col in range(game.cols - 3):
-                line = [game.board[row, col + i] for i in range(4)]
-                score += self._evaluate_line(line)
-
-        for row in range(game.rows - 3):
-            for col in range(game.cols):
-                line = [game.board[row + i, col] for i in range(4)]
-                score += self._evaluate_line(line)
-
-        for row in range(game.rows - 3):
-            for col in range(game.cols - 3):
-                line = [game.board[row + i, col + i] for i in range(4)]
-                score += self._evaluate_line(line)
-
-        for row in range(3, game.rows):
-            for col in range(game.cols - 3):
-                line = [game.board[row - i, col + i] for i in range(4)]
-                score += self._evaluate_line(line)
-
-        # Center preference
-        center_col = game.cols // 2
-        for row in range(game.rows):
-            if game.board[row, center_col] == self.player_id:
-                score += 2
-
-        return score
-
-    def _evaluate_line(self, line):
-        """Evaluate a line of 4 positions for Connect Four or 3 for Tic Tac Toe"""
-        my_pieces = line.count(self.player_id)
-        opp_pieces = line.count(3 - self.player_id)
-        empty_pieces = line.count(0)
-
-        if my_pieces == len(line):  # Winning line
-            return 100
-        elif opp_pieces == len(line):  # Opponent winning line
-            return -100
-        elif opp_pieces == 0 and my_pieces > 0:  # Potential for me
-            if my_pieces == len(line) - 1:  # One move from win
-                return 10
-            return my_pieces
-        elif my_pieces == 0 and opp_pieces > 0:  # Potential for opponent
-            if opp_pieces == len(line) - 1:  # One move from loss
-                return -10
-            return -opp_pieces
-        return 0  # Blocked line
\ No newline at end of file
+            return 0  # Draw
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict
 
 
 class BasePlayer(ABC):
+    # Players that can pick moves for many games at once from a valid-move mask
+    supports_batch = False
+
     def __init__(self, player_id: int):
         self.player_id = player_id
 
@@ -10,5 +13,17 @@ class BasePlayer(ABC):
     def get_move(self, game) -> Any:
         pass
 
+    def end_game(self):
+        """Called by GameSimulator once a game is over; players with background work stop it here"""
+        pass
+
+    def get_stats(self) -> Dict[str, int]:
+        """Counters accumulated over this player's moves, summed by GameSimulator"""
+        return {}
+
+    def get_batch_moves(self, valid_mask):
+        """Pick one action per row of a (games, actions) boolean valid-move mask"""
+        raise NotImplementedError(f"{self.__class__.__name__} cannot play batched games")
+
     def __str__(self):
         return f"{self.__class__.__name__} {self.player_id}"
\ No newline at end of file
@@ -0,0 +1,106 @@
+from .move_ordering import static_move_rank
+from .transposition_table import EXACT, LOWER_BOUND, UPPER_BOUND
+from typing import Any, List, Tuple
+
+# A win for the player to move scores WIN_SCORE minus the plies until it
+# happens, a loss the negative of that and a draw 0
+WIN_SCORE = 1000
+
+
+def parent_score(child_score: int) -> int:
+    """A child's score seen from its parent: negated, with wins and losses one ply further away"""
+    score = -child_score
+    if score > 0:
+        return score - 1
+    if score < 0:
+        return score + 1
+    return 0
+
+
+def terminal_score(game) -> int:
+    """Score of a finished game for the player to move, who has either lost or drawn"""
+    return 0 if game.winner == 0 else -WIN_SCORE
+
+
+class EndgameSolver:
+    """
+    Exact negamax solver with alpha-beta pruning for positions with few
+    empty cells. Results are exact game outcomes, so cached values stay valid
+    for the whole game; the cache is cleared when it reaches max_entries.
+    """
+
+    def __init__(self, max_entries: int = 2000000):
+        self.max_entries = max_entries
+        self.cache = {}  # position_key -> (score, flag)
+        self.static_rank = None
+        self.nodes = 0
+
+    def solve(self, game) -> Tuple[str, int, List[Any]]:
+        """('win' / 'loss' / 'draw' for the player to move, plies to the end, every move that achieves it)"""
+        if self.static_rank is None:
+            self.static_rank = static_move_rank(game)
+
+        best_score = -WIN_SCORE - 1
+        best_moves = []
+        for move in self._ordered_moves(game):
+            game.make_move(move)
+            # Alpha just below the best score keeps equal moves exact
+            score = parent_score(self._negamax(game, -WIN_SCORE - 1, -best_score + 2))
+            game.undo_move()
+            if score > best_score:
+                best_score = score
+                best_moves = [move]
+            elif score == best_score:
+                best_moves.append(move)
+
+        if best_score > 0:
+            return 'win', WIN_SCORE - best_score, best_moves
+        if best_score < 0:
+            return 'loss', WIN_SCORE + best_score, best_moves
+        return 'draw', game.rows * game.cols - game.move_count, best_moves
+
+    def _ordered_moves(self, game):
+        rank = self.static_rank
+        return sorted(game.get_valid_moves(), key=lambda move: rank[move])
+
+    def _negamax(self, game, alpha, beta):
+        self.nodes += 1
+        if game.game_over:
+            return terminal_score(game)
+
+        key = game.position_key
+        entry = self.cache.get(key)
+        if entry is not None:
+            score, flag = entry
+            if flag == EXACT:
+                return score
+            elif flag == LOWER_BOUND:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        window_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        for move in self._ordered_moves(game):
+            game.make_move(move)
+            # One ply shifts scores by one, so the child's window is widened by one on each side
+            score = parent_score(self._negamax(game, -beta - 1, -alpha + 1))
+            game.undo_move()
+            if score > best_score:
+                best_score = score
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                break
+
+        if len(self.cache) >= self.max_entries:
+            self.cache.clear()
+        if best_score <= window_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.cache[key] = (best_score, flag)
+        return best_score
@@ -0,0 +1,191 @@
+"""
+Window-table evaluation: every line of `length` cells on the board is
+precomputed once as an array of flat cell indices, each window's contents
+are packed into a base-3 pattern code (cell values are 0, 1 or 2), and a
+board scores the sum of a 3^length lookup table of per-pattern scores.
+
+IncrementalEvaluator keeps that sum up to date move by move: each window's
+pattern code and the running total only change for the windows through the
+cell that was filled or cleared.
+"""
+from functools import lru_cache
+from typing import Callable, List, Optional
+from games.tic_tac_toe import TicTacToe
+import numpy as np
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (-1, 1))  # Horizontal, vertical, diagonal, anti-diagonal
+
+
+@lru_cache(maxsize=None)
+def window_table(rows: int, cols: int, length: int) -> np.ndarray:
+    """Flat cell indices of every window of `length` cells, shape (windows, length)"""
+    windows = []
+    for d_row, d_col in DIRECTIONS:
+        for row in range(rows):
+            for col in range(cols):
+                end_row = row + d_row * (length - 1)
+                end_col = col + d_col * (length - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    windows.append([(row + d_row * i) * cols + col + d_col * i for i in range(length)])
+    return np.array(windows, dtype=np.intp).reshape(-1, length)
+
+
+def pattern_table(score_line: Callable[[List[int]], int], length: int) -> np.ndarray:
+    """score_line applied to every possible window, indexed by base-3 pattern code"""
+    scores = []
+    for code in range(3 ** length):
+        line = [code // 3 ** i % 3 for i in range(length)]
+        scores.append(score_line(line))
+    return np.array(scores, dtype=np.int64)
+
+
+def window_score(line: List[int], player_id: int) -> int:
+    """Score of one line of 4 cells for Connect Four or 3 for Tic Tac Toe, from player_id's view"""
+    my_pieces = line.count(player_id)
+    opp_pieces = line.count(3 - player_id)
+
+    if my_pieces == len(line):  # Winning line
+        return 100
+    elif opp_pieces == len(line):  # Opponent winning line
+        return -100
+    elif opp_pieces == 0 and my_pieces > 0:  # Potential for me
+        if my_pieces == len(line) - 1:  # One move from win
+            return 10
+        return my_pieces
+    elif my_pieces == 0 and opp_pieces > 0:  # Potential for opponent
+        if opp_pieces == len(line) - 1:  # One move from loss
+            return -10
+        return -opp_pieces
+    return 0  # Blocked line
+
+
+def center_scores(game, player_id: int) -> List[List[int]]:
+    """Bonus for a piece of each player on each cell: Tic Tac Toe center control, Connect Four center column"""
+    cells = game.rows * game.cols
+    scores = [[0] * cells for _ in range(3)]
+    if isinstance(game, TicTacToe):
+        scores[player_id][4] = 3
+        scores[3 - player_id][4] = -3
+    else:
+        for row in range(game.rows):
+            scores[player_id][row * game.cols + game.cols // 2] = 2
+    return scores
+
+
+class IncrementalEvaluator:
+    """
+    Window score of the current position, maintained through make/undo.
+
+    push(cell, player) and pop() touch only the windows through one cell
+    (at most 16 of the 69 Connect Four windows, 4 of the 8 Tic Tac Toe
+    lines). sync(game) catches up with whatever moves the game made or took
+    back since the last call, so a search can read `score` at its leaves
+    without pushing and popping alongside every make_move and undo_move.
+    """
+
+    def __init__(self, rows: int, cols: int, length: int, score_line: Callable[[List[int]], int],
+                 cell_scores: Optional[List[List[int]]] = None):
+        windows = window_table(rows, cols, length)
+        self.windows = windows
+        self.powers = 3 ** np.arange(length, dtype=np.int64)
+        self.pattern_scores = pattern_table(score_line, length).tolist()
+        self.cell_scores = cell_scores or [[0] * (rows * cols) for _ in range(3)]
+        # steps[player][cell]: (window, pattern code added by a piece of player on cell) for each window through it
+        steps = [[[] for _ in range(rows * cols)] for _ in range(3)]
+        for window, cells in enumerate(windows.tolist()):
+            for i, cell in enumerate(cells):
+                for player in (1, 2):
+                    steps[player][cell].append((window, player * 3 ** i))
+        self.steps = [[tuple(cell_steps) for cell_steps in player_steps] for player_steps in steps]
+
+        self.codes = [0] * len(windows)
+        self.score = self.pattern_scores[0] * len(windows)
+        self.moves = []  # (cell, player) pushed since the last reset
+        self.game = None
+        self.board = None  # Board array of self.game when last synced
+        self.key = None  # position_key of self.game when last synced
+        self.history = []  # move_history entries of self.game already applied, shared by identity
+
+    def reset(self, game):
+        """Recompute every window of `game`'s board; later moves are applied incrementally"""
+        board = np.asarray(game.board).reshape(-1)
+        codes = board[self.windows] @ self.powers
+        self.codes = codes.tolist()
+        pattern_scores = self.pattern_scores
+        self.score = sum(pattern_scores[code] for code in self.codes)
+        pieces = board.tolist()
+        for cell, player in enumerate(pieces):
+            if player:
+                self.score += self.cell_scores[player][cell]
+        self.game = game
+        self.board = game.board
+        self.key = game.position_key
+        self.history = list(game.move_history)
+        # Moves already on the board can still be taken back by pop()
+        cols = game.cols
+        self.moves = [(row * cols + col, pieces[row * cols + col]) for (row, col), *_ in self.history]
+
+    def push(self, cell: int, player: int):
+        codes = self.codes
+        pattern_scores = self.pattern_scores
+        delta = self.cell_scores[player][cell]
+        for window, step in self.steps[player][cell]:
+            code = codes[window]
+            codes[window] = code + step
+            delta += pattern_scores[code + step] - pattern_scores[code]
+        self.score += delta
+        self.moves.append((cell, player))
+
+    def pop(self):
+        cell, player = self.moves.pop()
+        codes = self.codes
+        pattern_scores = self.pattern_scores
+        delta = -self.cell_scores[player][cell]
+        for window, step in self.steps[player][cell]:
+            code = codes[window]
+            codes[window] = code - step
+            delta += pattern_scores[code - step] - pattern_scores[code]
+        self.score += delta
+
+    def sync(self, game) -> int:
+        """
+        Bring the evaluator to `game`'s current position and return its score.
+        A new game, a board assigned to the game, or a changed position key
+        without any move made or taken back starts over from the board.
+        """
+        if game is not self.game or game.board is not self.board:
+            self.reset(game)
+            return self.score
+
+        history = game.move_history
+        applied = self.history
+        # History entries are fresh tuples, so an entry still present by identity
+        # means neither it nor anything below it was taken back since
+        common = min(len(applied), len(history))
+        while common and applied[common - 1] is not history[common - 1]:
+            common -= 1
+        if common == len(applied) == len(history):
+            if game.position_key != self.key:
+                self.reset(game)  # The pieces changed some other way, e.g. keys recomputed for a new board
+            return self.score
+
+        while len(applied) > common:
+            applied.pop()
+            self.pop()
+        cols = game.cols
+        mover = game.current_player if (len(history) - common) % 2 == 0 else 3 - game.current_player
+        for entry in history[common:]:
+            row, col = entry[0]
+            self.push(row * cols + col, mover)
+            applied.append(entry)
+            mover = 3 - mover
+        self.key = game.position_key
+        return self.score
+
+
+def leaf_evaluator(game, player_id: int) -> IncrementalEvaluator:
+    """Incremental window_score evaluation plus center_scores for `game`'s board shape"""
+    # Lines of 3 in Tic Tac Toe, windows of 4 otherwise
+    length = 3 if isinstance(game, TicTacToe) else 4
+    return IncrementalEvaluator(game.rows, game.cols, length, lambda line: window_score(line, player_id),
+                                center_scores(game, player_id))
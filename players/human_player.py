@@ -8,11 +8,11 @@ class HumanPlayer(BasePlayer):
 
         while True:
             try:
-                if game.__class__.__name__ == "TicTacToe":
+                if isinstance(valid_moves[0], tuple):  # Cell moves: Tic Tac Toe, mnk without gravity
                     move_input = input("Enter your move as 'row,col': ")
                     row, col = map(int, move_input.split(','))
                     move = (row, col)
-                else:  # ConnectFour
+                else:  # ConnectFour and gravity mnk games
                     move = int(input("Enter column number: "))
 
                 if move in valid_moves:
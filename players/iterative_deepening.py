@@ -0,0 +1,71 @@
+import time
+from typing import Any, Callable, Optional, Tuple
+
+
+class SearchTimeout(Exception):
+    """Raised from inside a search when the per-move time budget is used up"""
+
+
+class Deadline:
+    """
+    Per-move time budget; check() is cheap enough to call at every search node.
+    `stop`, anything with an expired() method (e.g. a pondering StopSignal),
+    ends the budget early when it expires.
+    """
+
+    def __init__(self, time_limit_ms: float, check_interval: int = 256, stop=None):
+        self.end_time = time.perf_counter() + time_limit_ms / 1000
+        self.check_interval = check_interval
+        self.calls = 0
+        self.stop = stop
+
+    @classmethod
+    def until(cls, end_time: float):
+        """Deadline at a perf_counter() time, e.g. one handed to a worker process"""
+        deadline = cls(0)
+        deadline.end_time = end_time
+        return deadline
+
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.end_time or (self.stop is not None and self.stop.expired())
+
+    def check(self):
+        # Reading the clock on every node would cost more than the node itself
+        self.calls += 1
+        if self.calls % self.check_interval == 0 and self.expired():
+            raise SearchTimeout()
+
+
+def max_search_depth(game) -> int:
+    """Deepest useful search depth: one ply per empty cell left, depth 0 is a one-ply lookahead"""
+    return game.rows * game.cols - game.move_count - 1
+
+
+def iterative_deepening(game, search: Callable[[int, Optional[Deadline]], Any], time_limit_ms: float,
+                        max_depth: int, stop=None) -> Tuple[Any, int]:
+    """
+    Run search(depth, deadline) for depth 0, 1, 2, ... until the time budget
+    runs out or max_depth is finished.
+
+    Returns the result of the deepest finished iteration and its depth. The
+    depth 0 iteration always finishes so there is always a move to play; an
+    interrupted iteration is thrown away and its moves are taken back.
+    `stop` ends the search early like the budget running out (see Deadline).
+    """
+    deadline = Deadline(time_limit_ms, stop=stop)
+    history_length = len(game.move_history)
+
+    result = search(0, None)
+    depth_reached = 0
+    for depth in range(1, max_depth + 1):
+        if deadline.expired():
+            break
+        try:
+            result = search(depth, deadline)
+        except SearchTimeout:
+            while len(game.move_history) > history_length:
+                game.undo_move()
+            break
+        depth_reached = depth
+
+    return result, depth_reached
@@ -0,0 +1,197 @@
+from .base_player import BasePlayer
+from .iterative_deepening import Deadline
+from .parallel import get_pool
+import itertools
+import math
+import os
+import random
+
+# Tree kept by each worker process between moves for every player tag, with the move it last searched
+# and the visits it reported for it: tag -> (MCTSSearch, search id, root visits)
+_worker_searches = {}
+MAX_WORKER_TREES = 64
+_player_tags = itertools.count()
+
+
+class MCTSNode:
+    __slots__ = ('key', 'move', 'parent', 'children', 'untried', 'visits', 'wins', 'player_just_moved')
+
+    def __init__(self, game, move=None, parent=None):
+        self.key = game.position_key
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = [] if game.game_over else game.get_valid_moves()
+        self.visits = 0
+        self.wins = 0.0  # From the view of the player who moved into this node, draws count half
+        self.player_just_moved = 3 - game.current_player
+
+
+class MCTSSearch:
+    """UCT search from one position; the tree can be carried over to a later position of the same game"""
+
+    def __init__(self, exploration: float = math.sqrt(2), reuse_tree: bool = True):
+        self.exploration = exploration
+        self.reuse_tree = reuse_tree
+        self.root = None
+
+    def _find_root(self, game):
+        """Node for the current position: the old root itself, or one of its children or grandchildren"""
+        key = game.position_key
+        if self.reuse_tree and self.root is not None:
+            if self.root.key == key:
+                return self.root
+            for child in self.root.children:
+                if child.key == key:
+                    return child
+                for grandchild in child.children:
+                    if grandchild.key == key:
+                        return grandchild
+        return MCTSNode(game)
+
+    def run(self, game, iterations: int, deadline: Deadline = None):
+        """Run `iterations` playouts (or until the deadline); returns visits per root move and playouts run"""
+        root = self._find_root(game)
+        root.parent = None
+        root.move = None
+        self.root = root
+        history_length = len(game.move_history)
+
+        playouts = 0
+        while True:
+            # At least one playout, so the root always has a child to play
+            if deadline is None:
+                if playouts >= max(1, iterations):
+                    break
+            elif playouts and deadline.expired():
+                break
+            node = root
+
+            # Selection: follow UCT through fully expanded nodes
+            while not node.untried and node.children:
+                node = self._select_child(node)
+                game.make_move(node.move)
+
+            # Expansion: add one untried move
+            if node.untried:
+                move = node.untried.pop(random.randrange(len(node.untried)))
+                game.make_move(move)
+                child = MCTSNode(game, move, node)
+                node.children.append(child)
+                node = child
+
+            # Rollout: random moves to the end of the game
+            while not game.game_over:
+                game.make_move(random.choice(game.get_valid_moves()))
+            winner = game.winner
+
+            # Backpropagation
+            while node is not None:
+                node.visits += 1
+                if winner == node.player_just_moved:
+                    node.wins += 1
+                elif winner == 0:
+                    node.wins += 0.5
+                node = node.parent
+
+            while len(game.move_history) > history_length:
+                game.undo_move()
+            playouts += 1
+
+        return {child.move: child.visits for child in root.children}, playouts
+
+    def _select_child(self, node):
+        log_visits = math.log(node.visits)
+        return max(node.children, key=lambda child: child.wins / child.visits
+                   + self.exploration * math.sqrt(log_visits / child.visits))
+
+    def tree_size(self) -> int:
+        size = 0
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            size += 1
+            stack.extend(node.children)
+        return size
+
+
+def _search_worker(task):
+    """
+    Worker: grow this process's tree for the player, continuing it from the
+    previous move whichever of the move's tasks this worker gets
+    """
+    tag, search_id, game, iterations, time_limit_ms, exploration, reuse_tree, seed = task
+    random.seed(seed)
+    deadline = Deadline(time_limit_ms) if time_limit_ms > 0 else None
+
+    search, last_search_id, reported = _worker_searches.pop(tag, (None, None, {}))
+    if search is None:
+        search = MCTSSearch(exploration, reuse_tree)
+
+    visits, playouts = search.run(game, iterations, deadline)
+    new_visits = visits
+    if last_search_id == search_id:
+        # A second task of the same move grew the tree again; only its own visits are new to the parent
+        new_visits = {move: count - reported.get(move, 0) for move, count in visits.items()}
+    _worker_searches[tag] = (search, search_id, visits)  # Most recently used last
+    while len(_worker_searches) > MAX_WORKER_TREES:
+        del _worker_searches[next(iter(_worker_searches))]
+    return new_visits, playouts, search.tree_size()
+
+
+class MCTSPlayer(BasePlayer):
+    """
+    Monte Carlo Tree Search with UCT selection and random rollouts.
+
+    Each move runs `iterations` playouts, or as many as fit in time_limit_ms,
+    and plays the most visited move. With workers > 1 the search is
+    root-parallel: every worker of a shared process pool grows its own tree
+    for the full budget and the root visit counts are summed. With
+    reuse_tree the subtree below the position reached is searched further
+    on the next move instead of starting from scratch; in parallel every
+    worker keeps one tree per player and continues it, whichever task it gets.
+    """
+
+    def __init__(self, player_id: int, iterations: int = 1000, time_limit_ms: float = 0, workers: int = 1,
+                 exploration: float = math.sqrt(2), reuse_tree: bool = True):
+        super().__init__(player_id)
+        self.iterations = iterations
+        self.time_limit_ms = time_limit_ms
+        self.workers = workers
+        self.exploration = exploration
+        self.reuse_tree = reuse_tree
+        self.search = MCTSSearch(exploration, reuse_tree)
+        self.tag = (os.getpid(), next(_player_tags))  # Names this player's trees in the workers
+        self.playouts = 0
+        self.searched_moves = 0
+        self.peak_tree_size = 0
+
+    def get_move(self, game):
+        self.searched_moves += 1
+        if self.workers > 1:
+            # One task per worker; each grows the tree its process holds for this player
+            tasks = [(self.tag, self.searched_moves, game, self.iterations, self.time_limit_ms, self.exploration,
+                      self.reuse_tree, random.getrandbits(32)) for _ in range(self.workers)]
+            visits = {}
+            for worker_visits, playouts, tree_size in get_pool(self.workers).map(_search_worker, tasks):
+                for move, count in worker_visits.items():
+                    visits[move] = visits.get(move, 0) + count
+                self.playouts += playouts
+                self.peak_tree_size = max(self.peak_tree_size, tree_size)
+        else:
+            deadline = Deadline(self.time_limit_ms) if self.time_limit_ms > 0 else None
+            visits, playouts = self.search.run(game, self.iterations, deadline)
+            self.playouts += playouts
+            self.peak_tree_size = max(self.peak_tree_size, self.search.tree_size())
+
+        most_visits = max(visits.values())
+        return random.choice([move for move, count in visits.items() if count == most_visits])
+
+    def get_stats(self):
+        if not self.searched_moves:
+            return {}
+        return {
+            'playouts': self.playouts,
+            'searched_moves': self.searched_moves,
+            'tree_size_max': self.peak_tree_size
+        }
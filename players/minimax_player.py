@@ -1,61 +1,203 @@
-from games.connect_four import ConnectFour
 from games.tic_tac_toe import TicTacToe
 from .base_player import BasePlayer
+from .transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from .shared_transposition_table import SharedTranspositionTable
+from .iterative_deepening import Deadline, SearchTimeout, iterative_deepening, max_search_depth
+from .move_ordering import MoveOrderer
+from .opening_book import load_opening_book
+from .endgame_solver import EndgameSolver
+from .tic_tac_toe_oracle import tic_tac_toe_oracle
+from .evaluation import leaf_evaluator
+from .threats import find_threats, threat_moves
+from . import parallel
+import itertools
+import os
 import random
+import time
+
+# Worker-side players kept between moves, keyed by player tag, so their tables and history survive
+_worker_players = {}
+MAX_WORKER_PLAYERS = 16
+_player_tags = itertools.count()
+# Threat checks cost several nodes' worth of work, so they are skipped in the small subtrees near the leaves
+THREAT_MIN_DEPTH = 3
 
 
 class MinimaxPlayer(BasePlayer):
-    def __init__(self, player_id: int, depth: int = 3):
+    def __init__(self, player_id: int, depth: int = 3, tt_size: int = 0, time_limit_ms: float = 0,
+                 move_ordering: bool = False, workers: int = 1, opening_book: str = None, endgame_threshold: int = 0,
+                 oracle: bool = False, window_eval: bool = False, move_cache=None, threats: bool = False,
+                 shared_tt: bool = False):
         super().__init__(player_id)
         self.depth = depth
+        self.tt_size = tt_size
+        # Kept for the whole game so later moves reuse earlier searches. A shared table lives in shared
+        # memory, so parallel workers read and write one table instead of each filling their own
+        self.shared_tt = shared_tt
+        if tt_size <= 0:
+            self.transposition_table = None
+        elif shared_tt:
+            self.transposition_table = SharedTranspositionTable(tt_size)
+        else:
+            self.transposition_table = TranspositionTable(tt_size)
+        # With a time limit the search deepens until the budget runs out and `depth` is ignored
+        self.time_limit_ms = time_limit_ms
+        self.deadline = None
+        self.depths_reached = []  # Depth of the deepest finished iteration per timed move, None for book moves
+        # Killer/history/center-first ordering, built on the first move once the board shape is known
+        self.move_ordering = move_ordering
+        self.orderer = None
+        self.root_ply = 0
+        self.nodes = 0  # Positions visited by _minimax over the whole game
+        self.searched_moves = 0
+        # Above 1, root moves are searched in parallel on a shared process pool
+        self.workers = workers
+        self.tag = (os.getpid(), next(_player_tags))
+        self.worker_stats = {}  # Transposition table counters reported back by the workers
+        # Book positions are answered without searching
+        self.opening_book = load_opening_book(opening_book) if opening_book else None
+        self.book_hits = 0
+        # Tic Tac Toe moves come from the solved table instead of a search
+        self.oracle = oracle
+        self.oracle_hits = 0
+        # Positions with at most this many empty cells are solved exactly instead of searched
+        self.endgame_threshold = endgame_threshold
+        self.solver = EndgameSolver() if endgame_threshold > 0 else None
+        self.last_solution = None  # (outcome, plies to the end) of the latest solved position
+        self.solve_results = {'win': 0, 'loss': 0, 'draw': 0}
+        self.solve_seconds = 0.0
+        # Leaves are scored by open windows like A* does, with counts kept up to date move by move
+        self.window_eval = window_eval
+        self.leaf_evaluator = None
+        # MoveCache shared across games; fixed-depth results are looked up before searching
+        self.move_cache = move_cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Immediate wins and single forced blocks are played without searching, and the search
+        # only looks at wins, forced blocks or moves that do not play under an opponent threat
+        self.threats = threats
+        self.forced_moves = 0
+        self.threat_pruned = 0  # Moves dropped inside the search
 
     def get_move(self, game):
+        if self.oracle and isinstance(game, TicTacToe):
+            self.oracle_hits += 1
+            if self.time_limit_ms > 0:
+                self.depths_reached.append(None)
+            return random.choice(tic_tac_toe_oracle().best_moves(game))
+
+        if self.opening_book is not None:
+            entry = self.opening_book.probe(game)
+            if entry is not None:
+                self.book_hits += 1
+                if self.time_limit_ms > 0:
+                    self.depths_reached.append(None)  # Keeps search_depths aligned with the moves
+                return random.choice(entry[1])
+
+        if self.threats:
+            wins, blocks, _ = find_threats(game)
+            forced = wins or (blocks if len(blocks) == 1 else None)
+            if forced:
+                self.forced_moves += 1
+                if self.time_limit_ms > 0:
+                    self.depths_reached.append(None)
+                return random.choice(forced)
+
+        if self.solver is not None and max_search_depth(game) < self.endgame_threshold:
+            return self._solve_endgame(game)
+
+        cache_key = None
+        if self.move_cache is not None and self.cache_config() is not None:
+            cache_key = self.move_cache.key(game, self.cache_config())
+            cached_moves = self.move_cache.get(cache_key)
+            if cached_moves is not None:
+                self.cache_hits += 1
+                return random.choice(cached_moves)
+            self.cache_misses += 1
+
         valid_moves = game.get_valid_moves()
+        self.searched_moves += 1
+        self.root_ply = len(game.move_history)
+        if self.move_ordering:
+            if self.orderer is None:
+                self.orderer = MoveOrderer(game)
+            self.orderer.new_search()
+            valid_moves = self.orderer.order(valid_moves, 0)
+        if self.threats:
+            searched_moves = threat_moves(game, valid_moves)
+            self.threat_pruned += len(valid_moves) - len(searched_moves)
+            valid_moves = searched_moves
 
-        if game.__class__.__name__ == "TicTacToe":
-            return self._minimax_tic_tac_toe(game, valid_moves)
+        if self.time_limit_ms > 0:
+            return self._iterative_deepening_move(game, valid_moves)
+        if self.workers > 1:
+            best_moves, _ = self._search_root_parallel(game, valid_moves, self.depth)
         else:
-            return self._minimax_connect_four(game, valid_moves)
+            best_moves, _ = self._search_root(game, valid_moves, self.depth)
+        if cache_key is not None:
+            self.move_cache.put(cache_key, best_moves)
+        return random.choice(best_moves)
 
-    def _minimax_tic_tac_toe(self, game, valid_moves):
-        best_score = float('-inf')
-        best_moves = []
-        alpha = float('-inf')
-        beta = float('inf')
+    def cache_config(self):
+        """
+        Settings that decide the result of a fixed-depth search, part of the
+        move cache key. None when the result also depends on earlier searches
+        (the transposition table and killer/history tables kept across moves)
+        or on timing (a time limit, or workers racing to raise the shared
+        bound), so it must not be cached.
+        """
+        if self.time_limit_ms > 0 or self.tt_size > 0 or self.move_ordering or self.workers > 1:
+            return None
+        return 'minimax', self.depth, self.window_eval, self.threats
 
-        for move in valid_moves:
-            # Make a copy of the game state
-            game_copy = TicTacToe()
-            game_copy.board = game.board.copy()
-            game_copy.current_player = game.current_player
+    def end_game(self):
+        if self.shared_tt and self.transposition_table is not None:
+            self.transposition_table.close()  # Frees the shared memory now rather than whenever the player is collected
 
-            game_copy.make_move(move)
-            score = self._minimax(game_copy, self.depth, False, alpha, beta)
+    def _solve_endgame(self, game):
+        start = time.perf_counter()
+        outcome, distance, best_moves = self.solver.solve(game)
+        self.solve_seconds += time.perf_counter() - start
+        self.solve_results[outcome] += 1
+        self.last_solution = (outcome, distance)
+        if self.time_limit_ms > 0:
+            self.depths_reached.append(distance)  # The solve saw every line to the end
+        return random.choice(best_moves)
 
-            if score > best_score:
-                best_score = score
-                best_moves = [move]
-            elif score == best_score:
-                best_moves.append(move)
+    def _iterative_deepening_move(self, game, valid_moves):
+        # Each iteration searches the root moves best-first by the previous iteration's scores
+        move_order = list(valid_moves)
+        stop = self.deadline  # Set from outside, e.g. when pondering: ends the iterations early too
 
-            # Update alpha for the maximizing player
-            alpha = max(alpha, best_score)
+        def search(depth, deadline):
+            if self.workers > 1:
+                best_moves, scores = self._search_root_parallel(game, move_order, depth, deadline)
+            else:
+                self.deadline = deadline
+                best_moves, scores = self._search_root(game, move_order, depth)
+            move_order.sort(key=lambda move: scores[move], reverse=True)
+            return best_moves
 
+        try:
+            best_moves, depth_reached = iterative_deepening(game, search, self.time_limit_ms,
+                                                            max_search_depth(game), stop)
+        finally:
+            self.deadline = stop
+        self.depths_reached.append(depth_reached)
         return random.choice(best_moves)
 
-    def _minimax_connect_four(self, game, valid_moves):
+    def _search_root(self, game, valid_moves, depth):
         best_score = float('-inf')
         best_moves = []
+        scores = {}
         alpha = float('-inf')
         beta = float('inf')
 
         for move in valid_moves:
-            game_copy = ConnectFour()
-            game_copy.board = game.board.copy()
-            game_copy.current_player = game.current_player
-
-            game_copy.make_move(move)
-            score = self._minimax(game_copy, self.depth, False, alpha, beta)
+            game.make_move(move)
+            score = self._minimax(game, depth, False, alpha, beta)
+            game.undo_move()
+            scores[move] = score
 
             if score > best_score:
                 best_score = score
@@ -66,55 +208,172 @@ class MinimaxPlayer(BasePlayer):
             # Update alpha for the maximizing player
             alpha = max(alpha, best_score)
 
-        return random.choice(best_moves)
+        return best_moves, scores
+
+    def _search_root_parallel(self, game, valid_moves, depth, deadline=None):
+        """
+        Root moves are handed to the pool in order, one task each. Every task
+        starts from the best root score any worker has finished so far as its
+        alpha, so later moves are still pruned by earlier results.
+        """
+        pool = parallel.get_pool(self.workers)
+        bound = parallel.get_shared_bound(self.workers)
+        with bound.get_lock():
+            bound.value = float('-inf')
+
+        # Workers given the shared table use it instead of a table of their own
+        shared_table = self.transposition_table if self.shared_tt else None
+        settings = {'player_id': self.player_id, 'depth': self.depth, 'tt_size': 0 if self.shared_tt else self.tt_size,
+                    'move_ordering': self.move_ordering, 'window_eval': self.window_eval, 'threats': self.threats}
+        end_time = deadline.end_time if deadline is not None else None
+        tasks = [(self.tag, settings, shared_table, game, move, depth, end_time) for move in valid_moves]
+
+        scores = {}
+        timed_out = False
+        for move, score, stats in pool.imap(_search_root_move, tasks):
+            if score is None:
+                timed_out = True
+                continue
+            scores[move] = score
+            self.nodes += stats.pop('nodes', 0)
+            for name, value in stats.items():
+                self.worker_stats[name] = self.worker_stats.get(name, 0) + value
+        if timed_out:
+            raise SearchTimeout()
+
+        best_score = max(scores.values())
+        return [move for move in valid_moves if scores[move] == best_score], scores
 
     def _minimax(self, game, depth, is_maximizing, alpha, beta):
+        self.nodes += 1
+        if self.deadline is not None:
+            self.deadline.check()
         if depth == 0 or game.game_over:
             return self._evaluate(game)
 
+        moves = game.get_valid_moves()
+        orderer = self.orderer
+        if orderer is not None:
+            ply = len(game.move_history) - self.root_ply
+            moves = orderer.order(moves, ply)
+        if self.threats and depth >= THREAT_MIN_DEPTH:
+            searched_moves = threat_moves(game, moves)
+            self.threat_pruned += len(moves) - len(searched_moves)
+            moves = searched_moves
+        table = self.transposition_table
+        if table is not None:
+            key = game.position_key
+            entry = table.probe(key)
+            if entry is not None and entry[2] >= depth:
+                value, flag = entry[1], entry[3]
+                if flag == EXACT:
+                    return value
+                elif flag == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value
+            if entry is not None and entry[4] in moves:
+                # Try the best move of an earlier (shallower) search first
+                moves.remove(entry[4])
+                moves.insert(0, entry[4])
+            # The window actually searched decides the bound type of the result
+            window_alpha, window_beta = alpha, beta
+
+        best_move = None
         if is_maximizing:
             best_score = float('-inf')
-            for move in game.get_valid_moves():
-                game_copy = game.__class__()
-                game_copy.board = game.board.copy()
-                game_copy.current_player = game.current_player
-
-                game_copy.make_move(move)
-                score = self._minimax(game_copy, depth - 1, False, alpha, beta)
-                best_score = max(score, best_score)
+            for move in moves:
+                game.make_move(move)
+                score = self._minimax(game, depth - 1, False, alpha, beta)
+                game.undo_move()
+                if score > best_score:
+                    best_score = score
+                    best_move = move
 
                 # Alpha-beta pruning
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
+                    if orderer is not None:
+                        orderer.record_cutoff(move, ply, depth)
                     break  # Beta cut-off
-            return best_score
         else:
             best_score = float('inf')
-            for move in game.get_valid_moves():
-                game_copy = game.__class__()
-                game_copy.board = game.board.copy()
-                game_copy.current_player = game.current_player
-
-                game_copy.make_move(move)
-                score = self._minimax(game_copy, depth - 1, True, alpha, beta)
-                best_score = min(score, best_score)
+            for move in moves:
+                game.make_move(move)
+                score = self._minimax(game, depth - 1, True, alpha, beta)
+                game.undo_move()
+                if score < best_score:
+                    best_score = score
+                    best_move = move
 
                 # Alpha-beta pruning
                 beta = min(beta, best_score)
                 if beta <= alpha:
+                    if orderer is not None:
+                        orderer.record_cutoff(move, ply, depth)
                     break  # Alpha cut-off
-            return best_score
+
+        if table is not None:
+            if best_score <= window_alpha:
+                flag = UPPER_BOUND
+            elif best_score >= window_beta:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            table.store(key, best_score, depth, flag, best_move)
+        return best_score
+
+    def get_stats(self):
+        stats = {'nodes': self.nodes, 'searched_moves': self.searched_moves} if self.nodes else {}
+        if self.transposition_table is not None:
+            stats.update(self.transposition_table.get_stats())
+            if self.shared_tt and (self.transposition_table.hits or self.transposition_table.misses):
+                stats.update(_process_tt_stats(self.transposition_table))
+        for name, value in self.worker_stats.items():
+            stats[name] = stats.get(name, 0) + value
+        if self.opening_book is not None:
+            stats['book_hits'] = self.book_hits
+        if self.oracle:
+            stats['oracle_hits'] = self.oracle_hits
+        if self.move_cache is not None and self.cache_config() is not None:
+            stats['cache_hits'] = self.cache_hits
+            stats['cache_misses'] = self.cache_misses
+        if self.threats:
+            stats['forced_moves'] = self.forced_moves
+            stats['threat_pruned'] = stats.get('threat_pruned', 0) + self.threat_pruned  # Plus the workers'
+        if self.solver is not None:
+            stats['endgame_solves'] = sum(self.solve_results.values())
+            stats['endgame_wins'] = self.solve_results['win']
+            stats['endgame_losses'] = self.solve_results['loss']
+            stats['endgame_draws'] = self.solve_results['draw']
+            stats['endgame_nodes'] = self.solver.nodes
+            stats['endgame_solve_ms'] = round(self.solve_seconds * 1000)
+        depths_reached = [depth for depth in self.depths_reached if depth is not None]
+        if depths_reached:
+            stats['timed_moves'] = len(depths_reached)
+            stats['depth_reached_total'] = sum(depths_reached)
+            stats['depth_reached_max'] = max(depths_reached)
+        return stats
 
     def _evaluate(self, game):
+        # Window scores can add up past 100, so decided games then score 1000
+        win_score = 1000 if self.window_eval else 100
         if game.winner == self.player_id:
-            return 100
+            return win_score
         elif game.winner == 3 - self.player_id:
-            return -100
+            return -win_score
         elif game.winner == 0:  # Draw
             return 0
 
+        if self.window_eval:
+            if self.leaf_evaluator is None:
+                self.leaf_evaluator = leaf_evaluator(game, self.player_id)
+            return self.leaf_evaluator.sync(game)
+
         # Simple heuristic for ongoing games
-        if game.__class__.__name__ == "TicTacToe":
+        if isinstance(game, TicTacToe):
             return self._evaluate_tic_tac_toe(game)
         else:
             return self._evaluate_connect_four(game)
@@ -133,4 +392,48 @@ class MinimaxPlayer(BasePlayer):
         for row in range(game.rows):
             if game.board[row, center_col] == self.player_id:
                 score += 2
-        return score
\ No newline at end of file
+        return score
+
+
+def _process_tt_stats(counts):
+    """Shared table probes of this process, under names that stay apart when summed across processes"""
+    if isinstance(counts, SharedTranspositionTable):
+        counts = counts.get_stats()
+    pid = os.getpid()
+    return {f'tt_hits_pid{pid}': counts['tt_hits'], f'tt_misses_pid{pid}': counts['tt_misses']}
+
+
+def _search_root_move(task):
+    """Worker: search one root move of a parallel MinimaxPlayer search"""
+    tag, settings, shared_table, game, move, depth, end_time = task
+    player = _worker_players.pop(tag, None)
+    if player is None:
+        player = MinimaxPlayer(**settings)
+        if shared_table is not None:
+            player.transposition_table = shared_table
+    _worker_players[tag] = player  # Most recently used last
+    while len(_worker_players) > MAX_WORKER_PLAYERS:
+        del _worker_players[next(iter(_worker_players))]
+
+    player.root_ply = len(game.move_history)
+    if player.move_ordering and player.orderer is None:
+        player.orderer = MoveOrderer(game)
+    before = player.get_stats()
+    player.deadline = Deadline.until(end_time) if end_time is not None else None
+
+    bound = parallel.shared_bound
+    game.make_move(move)
+    try:
+        score = player._minimax(game, depth, False, bound.value, float('inf'))
+    except SearchTimeout:
+        return move, None, {}
+    finally:
+        player.deadline = None
+    parallel.raise_shared_bound(bound, score)
+
+    # Counters added by this task only
+    stats = {name: value - before.get(name, 0) for name, value in player.get_stats().items()
+             if name != 'searched_moves' and not name.endswith('_max')}
+    if shared_table is not None:
+        stats.update(_process_tt_stats(stats))
+    return move, score, stats
@@ -0,0 +1,62 @@
+"""
+Cross-game cache of root search results.
+
+A search whose result depends only on the position and the player's
+settings (fixed depth or node budget, no time limit, nothing carried over
+from earlier searches) always finds the same best moves, so the set is kept
+in an LRU-bounded map and the random tie-break is drawn from it on every
+later visit. Minimax only uses the cache without a transposition table,
+move ordering or workers. A* searches every position it stores from a fresh
+tree instead of one reused from earlier moves. One cache is shared by all games of a simulation run and can be
+pickled to disk so later runs start warm.
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+import os
+import pickle
+
+
+def game_signature(game) -> Tuple:
+    """Rule set of `game`: numpy and bitboard engines share position keys, and so share entries"""
+    return game.rows, game.cols, game.gravity, getattr(game, 'connect', None)
+
+
+class MoveCache:
+    def __init__(self, max_entries: int = 100000, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (position_key, signature, player config) -> best moves, oldest first
+        self.path = path
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def key(self, game, config: Hashable) -> Tuple:
+        return game.position_key, game_signature(game), config
+
+    def get(self, key) -> Optional[Tuple[Any, ...]]:
+        moves = self.entries.get(key)
+        if moves is not None:
+            self.entries.move_to_end(key)
+        return moves
+
+    def put(self, key, moves):
+        self.entries[key] = tuple(moves)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def load(self, path: str):
+        with open(path, 'rb') as f:
+            entries = pickle.load(f)
+        # Keep the most recently used entries if the file holds more than fit
+        for key, moves in list(entries.items())[-self.max_entries:]:
+            self.entries[key] = moves
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(self.entries, f, protocol=pickle.HIGHEST_PROTOCOL)
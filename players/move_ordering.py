@@ -0,0 +1,54 @@
+from games.tic_tac_toe import TicTacToe
+from typing import Dict, List
+
+NUM_KILLERS = 2  # Killer moves remembered per ply
+
+
+def static_move_rank(game) -> Dict:
+    """
+    Rank of every move on an empty board, lower is searched first: columns
+    from the center out for gravity games, center then corners then edges
+    for Tic Tac Toe, and cells by distance from the center otherwise.
+    """
+    if game.gravity:
+        center = (game.cols - 1) / 2
+        return {col: abs(col - center) for col in range(game.cols)}
+    if isinstance(game, TicTacToe):
+        return {(row, col): 0 if (row, col) == (1, 1) else 1 if row != 1 and col != 1 else 2
+                for row in range(3) for col in range(3)}
+    center_row, center_col = (game.rows - 1) / 2, (game.cols - 1) / 2
+    return {(row, col): abs(row - center_row) + abs(col - center_col)
+            for row in range(game.rows) for col in range(game.cols)}
+
+
+class MoveOrderer:
+    """
+    Orders moves for alpha-beta: killer moves of the same ply first, then
+    moves by history score (how often and how deep they caused cut-offs),
+    then the static center-first order.
+    """
+
+    def __init__(self, game):
+        self.static_rank = static_move_rank(game)
+        self.killers = []  # killers[ply] holds up to NUM_KILLERS moves, newest first
+        self.history = {}
+
+    def new_search(self):
+        """Age the history scores so the current position's cut-offs dominate"""
+        for move in self.history:
+            self.history[move] //= 2
+
+    def order(self, moves: List, ply: int) -> List:
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+        rank = self.static_rank
+        return sorted(moves, key=lambda move: (move not in killers, -history.get(move, 0), rank[move]))
+
+    def record_cutoff(self, move, ply: int, depth: int):
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[NUM_KILLERS:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
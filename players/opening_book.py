@@ -0,0 +1,66 @@
+"""
+Opening books: a sorted array of (canonical position key, value, best-move
+bitmask) records saved as a .npy file.
+
+Keys are canonical_key() values, so one record covers every symmetric
+image of a position, and best moves are stored as bits of their move index
+(column, or row * cols + col) in the canonical frame. Books are opened with
+np.load(mmap_mode='r'): lookups binary-search the memory-mapped keys, and
+every process that opens the same file shares one copy in the page cache.
+"""
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+import numpy as np
+
+BOOK_DTYPE = np.dtype([
+    ('key', '<u8'),
+    ('value', '<i2'),  # Search score from the view of the player to move
+    ('best_moves', '<u2')  # Bit i set: move index i is one of the best moves
+])
+
+
+def move_to_index(game, move) -> int:
+    return move if game.gravity else move[0] * game.cols + move[1]
+
+
+def best_move_mask(game, moves: List, transform: int) -> int:
+    """Bitmask of `moves`, mapped into the canonical frame of `transform`"""
+    mask = 0
+    for move in moves:
+        mask |= 1 << move_to_index(game, game.transform_move(move, transform))
+    return mask
+
+
+def save_book(path: str, records: List[Tuple[int, int, int]]):
+    """Write (canonical key, value, best-move mask) records sorted by key"""
+    book = np.array(records, dtype=BOOK_DTYPE)
+    book.sort(order='key')
+    np.save(path, book)
+
+
+class OpeningBook:
+    def __init__(self, path: str):
+        self.entries = np.load(path, mmap_mode='r')
+        self.keys = self.entries['key']
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def probe(self, game) -> Optional[Tuple[int, List[Any]]]:
+        """(value, best moves) for the current position, or None if it is not in the book"""
+        key, transform = game.canonical_key()
+        index = int(np.searchsorted(self.keys, np.uint64(key)))
+        if index == len(self.keys) or int(self.keys[index]) != key:
+            return None
+
+        entry = self.entries[index]
+        mask = int(entry['best_moves'])
+        moves = [game.inverse_transform_move(game.decode_move(i), transform)
+                 for i in range(mask.bit_length()) if mask >> i & 1]
+        return int(entry['value']), moves
+
+
+@lru_cache(maxsize=None)
+def load_opening_book(path: str) -> OpeningBook:
+    """One mapping per file and process, shared by every player that uses it"""
+    return OpeningBook(path)
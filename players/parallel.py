@@ -0,0 +1,55 @@
+import atexit
+from multiprocessing import Pool, Value, resource_tracker
+
+# One pool per worker count, shared by every player in this process and kept
+# until exit, so neither a new move nor a new game pays for starting processes
+_pools = {}
+
+# Inside a worker: the bound shared with the parent of its pool
+shared_bound = None
+
+
+def _init_worker(bound):
+    global shared_bound
+    shared_bound = bound
+
+
+def get_pool(processes: int):
+    return _get_entry(processes)[0]
+
+
+def get_shared_bound(processes: int):
+    """
+    Lock-protected double shared by the parent and every worker of the pool
+    for `processes`, e.g. the best root score found so far. Only one search
+    uses a pool at a time, since get_move blocks until its workers finish.
+    """
+    return _get_entry(processes)[1]
+
+
+def raise_shared_bound(bound, value: float):
+    with bound.get_lock():
+        if value > bound.value:
+            bound.value = value
+
+
+def _get_entry(processes: int):
+    entry = _pools.get(processes)
+    if entry is None:
+        bound = Value('d', float('-inf'))
+        # Workers inherit the running tracker, so shared memory they attach to (SharedTranspositionTable)
+        # is tracked once, by the process that frees it, instead of by a tracker per worker
+        resource_tracker.ensure_running()
+        pool = Pool(processes, _init_worker, (bound,))
+        entry = _pools[processes] = (pool, bound)
+    return entry
+
+
+def close_pools():
+    for pool, _ in _pools.values():
+        pool.close()
+        pool.join()
+    _pools.clear()
+
+
+atexit.register(close_pools)
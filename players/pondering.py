@@ -0,0 +1,163 @@
+"""
+Pondering: searching on the opponent's time.
+
+PonderingPlayer wraps a Minimax or A* player. After each of its moves a
+background thread plays the opponent's replies on a copy of the game, most
+likely first, and searches every resulting position with a second player
+of the same settings. When the opponent's actual move is one of them, the
+stored answer is played at once (a ponder hit). If that position is still
+being searched, the wrapper waits for it to finish. Otherwise the thread
+is stopped and the wrapped player searches as usual.
+
+The thread shares the interpreter with everything else in the process, so
+pondering saves wall-clock time when the opponent is waiting rather than
+computing, e.g. a human at the prompt or a player searching in worker
+processes.
+"""
+from .base_player import BasePlayer
+from .iterative_deepening import SearchTimeout
+from .move_ordering import static_move_rank
+from .threats import find_threats
+import copy
+import threading
+import time
+
+
+class StopSignal:
+    """Stand-in for a Deadline that expires when the pondering thread is told to stop"""
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def stop(self):
+        self.event.set()
+
+    def expired(self) -> bool:
+        return self.event.is_set()
+
+    def check(self):
+        if self.event.is_set():
+            raise SearchTimeout()
+
+
+def likely_replies(game):
+    """Valid moves ordered by how likely the player to move is to choose them: wins, forced blocks, then center-out"""
+    moves = game.get_valid_moves()
+    wins, blocks, _ = find_threats(game, moves)
+    rank = static_move_rank(game)
+    return sorted(moves, key=lambda move: (move not in wins, move not in blocks, rank[move]))
+
+
+class PonderingPlayer(BasePlayer):
+    def __init__(self, player, ponder_player):
+        super().__init__(player.player_id)
+        self.player = player
+        # Searches in the background thread only, so the two never share search state
+        self.ponder_player = ponder_player
+        self.thread = None
+        self.signal = None
+        self.finish = None  # Set: stop after the position being searched now
+        self.lock = threading.Lock()
+        self.results = {}  # position_key -> (move, search seconds, depths_reached entries)
+        self.pondering_key = None
+        self.depths_reached = []  # Per move, like the wrapped player's, for the search_depths column
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self.ponder_searches = 0
+        self.saved_seconds = 0.0
+
+    def get_move(self, game):
+        pondered = self.thread is not None
+        waited = self._stop_pondering(game.position_key)
+        entry = self.results.pop(game.position_key, None)
+        self.results = {}
+
+        if entry is not None:
+            move, seconds, depths = entry
+            self.ponder_hits += 1
+            self.saved_seconds += max(0.0, seconds - waited)
+            self.depths_reached.extend(depths)
+        else:
+            if pondered:
+                self.ponder_misses += 1
+            depths = getattr(self.player, 'depths_reached', [])
+            before = len(depths)
+            move = self.player.get_move(game)
+            self.depths_reached.extend(depths[before:])
+
+        self._start_pondering(game, move)
+        return move
+
+    def end_game(self):
+        self._stop_pondering(None)
+        self.player.end_game()
+        self.ponder_player.end_game()
+
+    def _start_pondering(self, game, move):
+        position = copy.deepcopy(game)
+        position.make_move(move)
+        if position.game_over:
+            return
+        self.signal = StopSignal()
+        self.finish = threading.Event()
+        self.thread = threading.Thread(target=self._ponder, args=(position, self.signal, self.finish), daemon=True)
+        self.thread.start()
+
+    def _stop_pondering(self, key) -> float:
+        """Stop the thread, letting it finish first if it is searching `key`; returns the seconds waited"""
+        if self.thread is None:
+            return 0.0
+        start = time.perf_counter()
+        with self.lock:
+            if key is not None and key == self.pondering_key:
+                self.finish.set()
+            else:
+                self.signal.stop()
+        self.thread.join()
+        self.thread = None
+        self.pondering_key = None
+        return time.perf_counter() - start
+
+    def _ponder(self, position, signal, finish):
+        player = self.ponder_player
+        # Minimax checks the signal at every node and A* between expansions; with a time limit
+        # their per-move Deadline consults it too
+        player.deadline = signal
+        for reply in likely_replies(position):
+            position.make_move(reply)
+            if not position.game_over:
+                with self.lock:
+                    if signal.expired() or finish.is_set():
+                        return
+                    self.pondering_key = position.position_key
+                depths = getattr(player, 'depths_reached', [])
+                before = len(depths)
+                start = time.perf_counter()
+                try:
+                    move = player.get_move(position)
+                except SearchTimeout:
+                    return  # The position copy is abandoned with the search's moves still on it
+                seconds = time.perf_counter() - start
+                with self.lock:
+                    if signal.expired():
+                        return  # Cut short, so not a full search
+                    self.results[position.position_key] = (move, seconds, depths[before:])
+                    self.ponder_searches += 1
+                    if finish.is_set():
+                        return
+            position.undo_move()
+
+    def get_stats(self):
+        stats = dict(self.player.get_stats())
+        stats['ponder_hits'] = self.ponder_hits
+        stats['ponder_misses'] = self.ponder_misses
+        stats['ponder_searches'] = self.ponder_searches
+        stats['ponder_saved_ms'] = round(self.saved_seconds * 1000)
+        ponder_stats = self.ponder_player.get_stats()
+        for name in ('nodes', 'nodes_expanded'):
+            if name in ponder_stats:
+                stats[f'ponder_{name}'] = ponder_stats[name]
+        return stats
+
+    def __str__(self):
+        return str(self.player)
@@ -1,8 +1,6 @@
 from .base_player import BasePlayer
 import random
-
-from .base_player import BasePlayer
-import random
+import numpy as np
 
 
 class QuantumPlayer(BasePlayer):
@@ -16,6 +14,7 @@ class QuantumPlayer(BasePlayer):
     _quantum_buffer = []
     _buffer_index = 0
     _buffer_size = 1000  # Pre-generate 1000 quantum random numbers at once
+    supports_batch = True
 
     @classmethod
     def _initialize_quantum(cls):
@@ -89,6 +88,32 @@ class QuantumPlayer(BasePlayer):
         move_index = quantum_number % len(valid_moves)
         return valid_moves[move_index]
 
+    def _take_quantum_numbers(self, count):
+        """Take the next `count` numbers from the buffer, refilling it as needed"""
+        numbers = []
+        while len(numbers) < count:
+            if self._buffer_index >= len(self._quantum_buffer):
+                self._refill_quantum_buffer()
+                self._buffer_index = 0
+            take = min(count - len(numbers), len(self._quantum_buffer) - self._buffer_index)
+            numbers.extend(self._quantum_buffer[self._buffer_index:self._buffer_index + take])
+            self._buffer_index += take
+        return np.array(numbers, dtype=np.int64)
+
+    def get_batch_moves(self, valid_mask):
+        """Same mapping as get_move, applied to every row of the mask at once"""
+        num_valid = valid_mask.sum(axis=1)
+        move_index = np.empty(len(valid_mask), dtype=np.int64)
+
+        # Rows with two or fewer moves use classical randomness, as in get_move
+        small = num_valid <= 2
+        move_index[small] = [random.randrange(n) for n in num_valid[small]]
+        if (~small).any():
+            move_index[~small] = self._take_quantum_numbers(int((~small).sum())) % num_valid[~small]
+
+        # Convert "n-th valid action" into an action index
+        return (np.cumsum(valid_mask, axis=1) > move_index[:, None]).argmax(axis=1)
+
 # class QuantumPlayer(BasePlayer):
 #     def get_move(self, game):
 #         valid_moves = game.get_valid_moves()
@@ -1,7 +1,17 @@
 from .base_player import BasePlayer
 import random
+import numpy as np
 
 class RandomPlayer(BasePlayer):
+    supports_batch = True
+
     def get_move(self, game):
         valid_moves = game.get_valid_moves()
-        return random.choice(valid_moves)
\ No newline at end of file
+        return random.choice(valid_moves)
+
+    def get_batch_moves(self, valid_mask):
+        # Uniform choice among valid actions: the largest random key wins
+        rng = np.random.default_rng(random.getrandbits(64))
+        keys = rng.random(valid_mask.shape)
+        keys[~valid_mask] = -1.0
+        return keys.argmax(axis=1)
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Transposition table in shared memory, readable and writable by every
+process attached to it without locks.
+
+Each slot is two 64-bit words: `data`, the entry packed into bit fields
+(see DEFAULT_LAYOUT), and `check`, the position key XORed with `data`.
+A probe only accepts a slot whose check XOR data gives back the key it is
+looking for, so a slot torn by two processes writing at once reads as a
+miss instead of a wrong entry ("lockless hashing"). The replacement scheme
+is TranspositionTable's: two slots per bucket, one depth-preferred and one
+always-replace.
+
+Pickling a table sends only the segment name, so a table handed to a pool
+worker attaches to the same memory. Hit, miss, store and eviction counts
+are kept by each process for its own probes.
+"""
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+import weakref
+from .transposition_table import Entry
+
+# Bits per field of the data word, packed from the lowest bit up. The top
+# bit marks a used slot, so the fields may take up to 63 bits.
+DEFAULT_LAYOUT = {'value': 32, 'depth': 8, 'flag': 2, 'move': 16}
+FIELDS = ('value', 'depth', 'flag', 'move')
+USED_BIT = 1 << 63
+WORDS_PER_BUCKET = 4  # Depth-preferred (check, data), then always-replace (check, data)
+
+# Tables already attached in this process by segment name, so unpickling the
+# same table for every task of a search does not map it again
+_attached = weakref.WeakValueDictionary()
+
+
+class SharedTranspositionTable:
+    def __init__(self, max_entries: int, layout: Optional[Dict[str, int]] = None, name: Optional[str] = None):
+        self.num_buckets = max(1, max_entries // 2)
+        self.layout = dict(layout or DEFAULT_LAYOUT)
+        if set(self.layout) != set(FIELDS) or sum(self.layout.values()) > 63 or self.layout['flag'] < 2:
+            raise ValueError(f"Entry layout needs {', '.join(FIELDS)} in at most 63 bits, flag at least 2: {layout}")
+        self.shifts = {}
+        shift = 0
+        for field in FIELDS:
+            self.shifts[field] = shift
+            shift += self.layout[field]
+        self.masks = {field: (1 << bits) - 1 for field, bits in self.layout.items()}
+        self.value_offset = 1 << (self.layout['value'] - 1)  # Values are stored with this bias to keep them unsigned
+        self.move_half = (self.layout['move'] - 1) // 2  # Bits for each of row and col in a (row, col) move
+
+        size = self.num_buckets * WORDS_PER_BUCKET * 8
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.slots = self.shm.buf[:size].cast('Q')
+        self.name = self.shm.name
+        _attached[self.name] = self
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __reduce__(self):
+        return attach_table, (self.name, self.num_buckets * 2, self.layout)
+
+    def probe(self, key: int) -> Optional[Entry]:
+        slots = self.slots
+        index = (key % self.num_buckets) * WORDS_PER_BUCKET
+        for slot in (index, index + 2):
+            data = slots[slot + 1]
+            if data and slots[slot] ^ data == key:
+                self.hits += 1
+                return self._unpack(key, data)
+        self.misses += 1
+        return None
+
+    def store(self, key: int, value, depth: int, flag: int, best_move=None):
+        data = self._pack(value, depth, flag, best_move)
+        if data is None:
+            return  # Not representable in this layout
+        self.stores += 1
+        slots = self.slots
+        index = (key % self.num_buckets) * WORDS_PER_BUCKET
+
+        deep_data = slots[index + 1]
+        deep_key = slots[index] ^ deep_data
+        if not deep_data or deep_key == key or depth >= deep_data >> self.shifts['depth'] & self.masks['depth']:
+            slots[index + 1] = data
+            slots[index] = key ^ data
+            if deep_data and deep_key != key:
+                # The displaced entry still gets a chance in the always-replace slot
+                self._replace_recent(index + 2, deep_key, deep_data)
+        else:
+            self._replace_recent(index + 2, key, data)
+
+    def _replace_recent(self, slot: int, key: int, data: int):
+        slots = self.slots
+        old_data = slots[slot + 1]
+        if old_data and slots[slot] ^ old_data != key:
+            self.evictions += 1
+        slots[slot + 1] = data
+        slots[slot] = key ^ data
+
+    def _pack(self, value, depth: int, flag: int, best_move) -> Optional[int]:
+        if not isinstance(value, int) or not -self.value_offset <= value < self.value_offset:
+            return None
+        masks, shifts = self.masks, self.shifts
+        # A shallower depth than searched is always safe to claim
+        depth = min(depth, masks['depth'])
+        return (USED_BIT | (value + self.value_offset) << shifts['value'] | depth << shifts['depth']
+                | flag << shifts['flag'] | self._encode_move(best_move) << shifts['move'])
+
+    def _unpack(self, key: int, data: int) -> Entry:
+        masks, shifts = self.masks, self.shifts
+        value = (data >> shifts['value'] & masks['value']) - self.value_offset
+        depth = data >> shifts['depth'] & masks['depth']
+        flag = data >> shifts['flag'] & masks['flag']
+        return key, value, depth, flag, self._decode_move(data >> shifts['move'] & masks['move'])
+
+    def _encode_move(self, move) -> int:
+        """0 for no move, column + 1, or a tagged (row, col) pair; moves that do not fit are dropped"""
+        tag = 1 << (self.layout['move'] - 1)
+        if isinstance(move, tuple):
+            row, col = move
+            if row >> self.move_half or col >> self.move_half:
+                return 0
+            return tag | row << self.move_half | col
+        if move is None or not 0 <= move < tag - 1:
+            return 0
+        return move + 1
+
+    def _decode_move(self, code: int):
+        tag = 1 << (self.layout['move'] - 1)
+        if code & tag:
+            return code >> self.move_half & ((1 << self.move_half) - 1), code & ((1 << self.move_half) - 1)
+        return code - 1 if code else None
+
+    def clear(self):
+        self.shm.buf[:len(self.slots) * 8] = bytes(len(self.slots) * 8)
+
+    def close(self):
+        """Detach from the memory; the creating process also frees it"""
+        if getattr(self, 'slots', None) is None:
+            return  # Already closed, or never attached
+        self.slots.release()
+        self.slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __del__(self):
+        try:
+            self.close()
+        except (OSError, BufferError):
+            pass
+
+    def get_stats(self):
+        return {
+            'tt_hits': self.hits,
+            'tt_misses': self.misses,
+            'tt_stores': self.stores,
+            'tt_evictions': self.evictions
+        }
+
+
+def attach_table(name: str, max_entries: int, layout: Dict[str, int]) -> SharedTranspositionTable:
+    """The table on segment `name`, attached once per process"""
+    table = _attached.get(name)
+    if table is None:
+        table = SharedTranspositionTable(max_entries, layout, name)
+    return table
@@ -0,0 +1,112 @@
+"""
+Threat detection for Tic Tac Toe, Connect Four and other connect-k games.
+
+Each player's pieces are packed into one integer, column by column from the
+bottom with a spare bit on top of every column (the layout of
+BitboardConnectFour), so shifting by 1, rows + 1, rows and rows + 2 moves a
+piece one cell vertically, horizontally or diagonally without wrapping.
+A few shifts and ANDs then give every empty cell that would complete a line
+for a player, and the valid moves are looked up in those masks: moves that
+win on the spot, cells the opponent must be stopped from filling, and in
+gravity games moves that fill the cell under an opponent winning cell.
+"""
+from functools import lru_cache
+from games.tic_tac_toe import TicTacToe
+from games.connect_four_bitboard import BitboardConnectFour
+from typing import Any, List, Optional, Tuple
+
+
+def win_length(game) -> int:
+    return getattr(game, 'connect', 3 if isinstance(game, TicTacToe) else 4)
+
+
+@lru_cache(maxsize=None)
+def cell_bits(rows: int, cols: int) -> Tuple[int, ...]:
+    """Bit of each flat cell index (row * cols + col)"""
+    return tuple(1 << (col * (rows + 1) + rows - 1 - row) for row in range(rows) for col in range(cols))
+
+
+@lru_cache(maxsize=None)
+def board_mask(rows: int, cols: int) -> int:
+    return sum(cell_bits(rows, cols))
+
+
+def winning_cells(pieces: int, empty: int, rows: int, length: int) -> int:
+    """Mask of the empty cells where one more piece makes `length` in a row"""
+    wins = 0
+    for shift in (1, rows + 1, rows, rows + 2):
+        for gap in range(length):  # Position of the empty cell within the line
+            cells = empty
+            for i in range(length):
+                if i != gap:
+                    distance = (i - gap) * shift
+                    cells &= pieces >> distance if distance > 0 else pieces << -distance
+            wins |= cells
+    return wins
+
+
+def player_masks(game) -> Tuple[int, int]:
+    """(player 1 pieces, player 2 pieces) in the threat bit layout"""
+    if isinstance(game, BitboardConnectFour):
+        return game.bitboards[1], game.bitboards[2]
+    bits = cell_bits(game.rows, game.cols)
+    masks = [0, 0, 0]
+    for cell, player in enumerate(game.board.reshape(-1).tolist()):
+        if player:
+            masks[player] |= bits[cell]
+    return masks[1], masks[2]
+
+
+def find_threats(game, moves: Optional[List[Any]] = None) -> Tuple[List[Any], List[Any], List[Any]]:
+    """
+    (winning moves, forced blocks, unsafe moves) for the player to move, in
+    the order of `moves` (default: all valid moves). Unsafe moves fill the
+    cell directly under one where the opponent would complete a line.
+    """
+    if moves is None:
+        moves = game.get_valid_moves()
+    rows, cols = game.rows, game.cols
+    bits = cell_bits(rows, cols)
+    length = win_length(game)
+    masks = player_masks(game)
+    own = masks[game.current_player - 1]
+    other = masks[2 - game.current_player]
+    empty = board_mask(rows, cols) & ~(own | other)
+    own_wins = winning_cells(own, empty, rows, length)
+    other_wins = winning_cells(other, empty, rows, length)
+
+    wins, blocks, unsafe = [], [], []
+    heights = getattr(game, 'heights', None)
+    for move in moves:
+        if game.gravity:
+            if heights is not None:
+                bit = 1 << (move * (rows + 1) + heights[move])
+            else:
+                bit = 1 << (move * (rows + 1))
+                while not bit & empty:
+                    bit <<= 1
+        else:
+            bit = bits[move[0] * cols + move[1]]
+        if bit & own_wins:
+            wins.append(move)
+        if bit & other_wins:
+            blocks.append(move)
+        if game.gravity and bit << 1 & other_wins:
+            unsafe.append(move)
+    return wins, blocks, unsafe
+
+
+def threat_moves(game, moves: List[Any]) -> List[Any]:
+    """
+    The moves worth searching: one immediate win if there is any, else the
+    forced blocks, else every move that is not unsafe (all of them if none
+    are safe)
+    """
+    wins, blocks, unsafe = find_threats(game, moves)
+    if wins:
+        return wins[:1]
+    if blocks:
+        return blocks
+    if unsafe:
+        return [move for move in moves if move not in unsafe] or moves
+    return moves
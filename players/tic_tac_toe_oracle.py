@@ -0,0 +1,50 @@
+from functools import lru_cache
+from games.tic_tac_toe import TicTacToe
+from .endgame_solver import parent_score, terminal_score
+from typing import Any, Dict, Tuple
+
+
+class TicTacToeOracle:
+    """
+    Perfect play for every reachable Tic Tac Toe position, solved once.
+
+    Maps position_key to the exact score for the player to move (see
+    endgame_solver: a win scores WIN_SCORE minus the plies until it happens)
+    and every move that achieves it. TicTacToe and BitboardTicTacToe share
+    position keys, so one table serves both engines.
+    """
+
+    def __init__(self):
+        self.table: Dict[int, Tuple[int, Tuple[Any, ...]]] = {}
+        self._solve(TicTacToe())
+
+    def _solve(self, game) -> int:
+        entry = self.table.get(game.position_key)
+        if entry is not None:
+            return entry[0]
+
+        scores = {}
+        for move in game.get_valid_moves():
+            game.make_move(move)
+            child = terminal_score(game) if game.game_over else self._solve(game)
+            game.undo_move()
+            scores[move] = parent_score(child)
+
+        best_score = max(scores.values())
+        self.table[game.position_key] = (best_score, tuple(move for move in scores if scores[move] == best_score))
+        return best_score
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def score(self, game) -> int:
+        return self.table[game.position_key][0]
+
+    def best_moves(self, game) -> Tuple[Any, ...]:
+        return self.table[game.position_key][1]
+
+
+@lru_cache(maxsize=None)
+def tic_tac_toe_oracle() -> TicTacToeOracle:
+    """The solved table, built on first use and shared by every player in the process"""
+    return TicTacToeOracle()
@@ -0,0 +1,74 @@
+from typing import Any, Optional, Tuple
+
+# Bound types of a stored search value
+EXACT = 0
+LOWER_BOUND = 1  # The search failed high: true value >= stored value
+UPPER_BOUND = 2  # The search failed low: true value <= stored value
+
+# Entry layout: (key, value, depth, flag, best_move)
+Entry = Tuple[int, Any, int, int, Any]
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of alpha-beta results keyed by a game's position_key.
+
+    The table holds at most max_entries results in buckets of two slots. The
+    depth-preferred slot is only taken over by a search at least as deep; the
+    always-replace slot takes whatever did not fit, so recent positions are
+    still found after the deep slot fills up.
+    """
+
+    def __init__(self, max_entries: int):
+        self.num_buckets = max(1, max_entries // 2)
+        self.depth_slots = [None] * self.num_buckets
+        self.recent_slots = [None] * self.num_buckets
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def probe(self, key: int) -> Optional[Entry]:
+        index = key % self.num_buckets
+        entry = self.depth_slots[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self.recent_slots[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key: int, value, depth: int, flag: int, best_move=None):
+        self.stores += 1
+        index = key % self.num_buckets
+        entry = (key, value, depth, flag, best_move)
+
+        deep = self.depth_slots[index]
+        if deep is None or deep[0] == key or depth >= deep[2]:
+            self.depth_slots[index] = entry
+            if deep is not None and deep[0] != key:
+                # The displaced entry still gets a chance in the always-replace slot
+                self._replace_recent(index, deep)
+        else:
+            self._replace_recent(index, entry)
+
+    def _replace_recent(self, index: int, entry: Entry):
+        old = self.recent_slots[index]
+        if old is not None and old[0] != entry[0]:
+            self.evictions += 1
+        self.recent_slots[index] = entry
+
+    def clear(self):
+        self.depth_slots = [None] * self.num_buckets
+        self.recent_slots = [None] * self.num_buckets
+
+    def get_stats(self):
+        return {
+            'tt_hits': self.hits,
+            'tt_misses': self.misses,
+            'tt_stores': self.stores,
+            'tt_evictions': self.evictions
+        }
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import time
+
+from main import GameSimulator
+from players.minimax_player import MinimaxPlayer
+from players.parallel import get_pool
+
+
+def random_positions(game_type, engine, count, max_opening_moves, seed):
+    """Unfinished positions reached by short random openings, the same for every run with this seed"""
+    rng = random.Random(seed)
+    simulator = GameSimulator()
+    positions = []
+    while len(positions) < count:
+        game = simulator.create_game(game_type, engine)
+        for _ in range(rng.randint(0, max_opening_moves)):
+            game.make_move(rng.choice(game.get_valid_moves()))
+            if game.game_over:
+                break
+        if not game.game_over:
+            positions.append(game)
+    return positions
+
+
+def benchmark(positions, depth, workers, tt_size, move_ordering, shared_tt=False):
+    """Time one get_move per position; returns (seconds, nodes)"""
+    if workers > 1:
+        get_pool(workers)  # Start the processes before the clock, as a long-running player would
+
+    seconds = 0.0
+    nodes = 0
+    for game in positions:
+        player = MinimaxPlayer(game.current_player, depth, tt_size, 0, move_ordering, workers, shared_tt=shared_tt)
+        start = time.perf_counter()
+        player.get_move(game)
+        seconds += time.perf_counter() - start
+        nodes += player.nodes
+        player.end_game()
+    return seconds, nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare serial and root-parallel minimax at equal depth')
+    parser.add_argument('game_type',
+                        choices=['tictactoe', 'connectfour', 'ttt', 'c4'],
+                        help='Type of game to search')
+    parser.add_argument('-d', '--depth', type=int, default=6,
+                        help='Minimax depth (default: 6)')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=[2, 4],
+                        help='Worker counts to compare with the serial search (default: 2 4)')
+    parser.add_argument('-n', '--positions', type=int, default=10,
+                        help='Number of random positions to search (default: 10)')
+    parser.add_argument('-e', '--engine', choices=['numpy', 'bitboard'], default='numpy',
+                        help='Board representation (default: numpy)')
+    parser.add_argument('-tt', '--tt_size', type=int, default=0,
+                        help='Transposition table entries per player (default: 0, disabled)')
+    parser.add_argument('--shared_tt', action='store_true',
+                        help='Workers share one transposition table in shared memory instead of one each')
+    parser.add_argument('--ordering', action='store_true',
+                        help='Enable killer/history/center-first move ordering')
+    parser.add_argument('--compare_ordering', action='store_true',
+                        help='Also search the positions serially with move ordering off and on and compare nodes')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for the random openings (default: 0)')
+
+    args = parser.parse_args()
+    positions = random_positions(args.game_type, args.engine, args.positions, 8, args.seed)
+
+    print(f"Minimax {args.game_type} depth {args.depth}, {len(positions)} positions ({args.engine} engine)")
+    print(f"{'Workers':>7} {'Time (s)':>10} {'Nodes':>14} {'Nodes/s':>12} {'Speedup':>8}")
+
+    serial_seconds = None
+    for workers in [1] + [w for w in args.workers if w > 1]:
+        seconds, nodes = benchmark(positions, args.depth, workers, args.tt_size, args.ordering, args.shared_tt)
+        if serial_seconds is None:
+            serial_seconds = seconds
+        print(f"{workers:>7} {seconds:>10.3f} {nodes:>14,} {nodes / seconds:>12,.0f} "
+              f"{serial_seconds / seconds:>7.2f}x")
+
+    if args.compare_ordering:
+        print("\nMove ordering, serial search of the same positions")
+        print(f"{'Ordering':>8} {'Time (s)':>10} {'Nodes':>14} {'Nodes/s':>12} {'Nodes saved':>12}")
+        unordered_nodes = None
+        for ordering in (False, True):
+            seconds, nodes = benchmark(positions, args.depth, 1, args.tt_size, ordering, args.shared_tt)
+            if unordered_nodes is None:
+                unordered_nodes = nodes
+            print(f"{'on' if ordering else 'off':>8} {seconds:>10.3f} {nodes:>14,} {nodes / seconds:>12,.0f} "
+                  f"{(1 - nodes / unordered_nodes) * 100:>11.1f}%")
+
+
+if __name__ == "__main__":
+    main()